@@ -0,0 +1,70 @@
+"""
+Regression benchmark for the `date` op on a ~1 MB input with thousands of dates.
+
+The "before" variant is the previous implementation (one `DETECT_DATE.sub(..., count=1)` per match, rescanning
+the text from the start each time), kept here as reference only.
+
+Usage: python benchmarks/date_op.py [size_in_bytes] [max_seconds]
+
+Exits with 1 if the full-size run takes longer than max_seconds.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_transliterate.core import PolishTransliterate
+
+LINE = '2023-%02d-%02d wpis z dnia %d.%d.%d zarejestrowano zdarzenie numer %d w systemie, status ok. '
+
+
+def make_text(size):
+    parts = []
+    n = 0
+    length = 0
+    while length < size:
+        part = LINE % (n % 12 + 1, n % 28 + 1, n % 28 + 1, n % 12 + 1, 1990 + n % 40, n)
+        parts.append(part)
+        length += len(part)
+        n += 1
+    return ''.join(parts)
+
+
+def date_op_before(transliterator, text):
+    for date_m in transliterator.regex.DETECT_DATE.finditer(text):
+        repl = transliterator._expand_date(date_m)
+        text = transliterator.regex.DETECT_DATE.sub(repl, text, count=1)
+    return text
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(size=1000000, max_seconds=None):
+    transliterator = PolishTransliterate(transliterate_ops=['date'])
+
+    # the previous implementation is quadratic, so it is only run on the smaller inputs
+    for n in (size // 40, size // 20, size // 10, size):
+        text = make_text(n)
+        dates = sum(1 for _ in transliterator.regex.DETECT_DATE.finditer(text))
+        after, after_result = _timed(transliterator._date_op, text)
+        line = '%6.2f MB, %6d dates: after %8.3f s' % (len(text.encode('utf-8')) / 1e6, dates, after)
+        if n < size:
+            before, before_result = _timed(date_op_before, transliterator, text)
+            assert before_result == after_result
+            line += ', before %8.3f s (%.1fx)' % (before, before / after)
+        print(line)
+
+    if max_seconds is not None and after > max_seconds:
+        print('REGRESSION: %.3f s > %.3f s' % (after, max_seconds))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+                  float(sys.argv[2]) if len(sys.argv) > 2 else None))
@@ -0,0 +1,57 @@
+"""
+Per-word cost of the `special` op on ordinary prose, before/after precompiling and prefiltering
+`RegExConfig.SPECIAL_TRANSLITERATE`.
+
+The "before" variant is the previous implementation, kept here as reference only.
+
+Usage: python benchmarks/special_op.py [repeat]
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_transliterate.core import PolishTransliterate
+
+PROSE = ('Na skraju lasu stał stary dom, w którym mieszkała rodzina Kowalskich. Każdego ranka ojciec '
+         'wychodził do pracy, a dzieci biegły do szkoły przez łąkę pełną kwiatów. Wieczorami wszyscy '
+         'siadali przy stole i rozmawiali o tym, co wydarzyło się w ciągu dnia, w tym o 2 wizytach, '
+         '1/2 ciasta, spotkaniu 5-10 osób i firmie A&B. ')
+
+
+def special_op_before(transliterator, word):
+    for pat, tup_repl in transliterator.regex.SPECIAL_TRANSLITERATE.items():
+        if re.search(pat, word):
+            word = word.replace(tup_repl[0], tup_repl[1], 1)
+            ws = []
+            for w in word.split(' '):
+                if transliterator.regex.DETECT_NUMBER.match(w):
+                    ws.append(transliterator._transliterate_number(w))
+                else:
+                    ws.append(w)
+            if ws:
+                word = ' '.join(ws)
+    return word
+
+
+def main(repeat=20):
+    transliterator = PolishTransliterate()
+    words = [w for w in PROSE.lower().split(' ') if w] * 50
+
+    for w in set(words):
+        assert special_op_before(transliterator, w) == transliterator._special_op(w), w
+
+    before = min(timeit.repeat(lambda: [special_op_before(transliterator, w) for w in words],
+                               number=1, repeat=repeat))
+    after = min(timeit.repeat(lambda: [transliterator._special_op(w) for w in words],
+                              number=1, repeat=repeat))
+    print('words: %d' % len(words))
+    print('before: %8.3f us/word' % (before / len(words) * 1e6))
+    print('after:  %8.3f us/word' % (after / len(words) * 1e6))
+    print('speedup: %.1fx' % (before / after))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
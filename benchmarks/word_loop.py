@@ -0,0 +1,79 @@
+"""
+Per-word loop of `PolishTransliterate.transliterate` on a 100k word corpus, before/after resolving the enabled
+word-level ops into a dispatch table at construction time (and tokenizing with type flags, so ops which only act on
+non-alphabetic tokens are skipped for plain words).
+
+The "before" variant is the previous loop (if/elif on op names, replacements applied one by one), kept here as
+reference only.
+
+Usage: python benchmarks/word_loop.py [words]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_transliterate.core import PolishTransliterate, Tokens
+
+SENTENCE = ('w pon. o godz. 8 rano mgr Nowak kupił 2 kg jabłek i 1/2 chleba, a np. dr Kowalski '
+            'zajął 3. miejsce w biegu na 5 km razem z 10 innymi zawodnikami')
+
+OPS = ['weekday', 'month', 'ordinal', 'special', 'math_symbol']
+
+
+def loop_before(transliterator, text):
+    # previous loop, adapted to the current op signatures (one shared list of words)
+    words = [w for w in text.split(' ') if w]
+    for idx in range(len(words)):
+        word = words[idx]
+
+        for tr in transliterator.transliterate_ops:
+            if tr == 'weekday':
+                word = transliterator._weekday_op(word)
+            elif tr == 'month':
+                word = transliterator._month_op(word)
+            elif tr == 'ordinal':
+                word = transliterator._ordinal_op(word, idx, words)
+            elif tr == 'special':
+                word = transliterator._special_op(word)
+            elif tr == 'math_symbol':
+                word = transliterator._math_symbol_op(word)
+            elif tr == 'spoken_symbol':
+                word = transliterator._spoken_symbol_op(word, idx, words)
+
+        for old, new in transliterator.replace.items():
+            word = word.replace(old, new)
+
+        word = transliterator._misc_abbreviation_op(word)
+        word = transliterator._number_unit_op(word, idx, words)
+
+        words[idx] = word
+    return words
+
+
+def loop_after(transliterator, text):
+    return transliterator._transliterate_words(Tokens(text)).words
+
+
+def main(words=100000, repeat=7):
+    transliterator = PolishTransliterate(transliterate_ops=OPS, replace={'-': ' ', ';': ','})
+    sentence = SENTENCE.lower().split(' ')
+    corpus = ' '.join(sentence * (words // len(sentence) + 1))
+
+    assert loop_before(transliterator, corpus) == loop_after(transliterator, corpus)
+
+    # interleaved, best of several runs, to keep machine noise out of the comparison
+    before = after = float('inf')
+    for _ in range(repeat):
+        before = min(before, timeit.timeit(lambda: loop_before(transliterator, corpus), number=1))
+        after = min(after, timeit.timeit(lambda: loop_after(transliterator, corpus), number=1))
+
+    n = len(corpus.split(' '))
+    print('words: %d' % n)
+    print('before: %8.3f s, %6.2f us/word' % (before, before / n * 1e6))
+    print('after:  %8.3f s, %6.2f us/word' % (after, after / n * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,133 @@
+"""
+asyncio front end for serving transliteration inside an event loop (aiohttp, FastAPI, ...)
+
+The work is offloaded to a thread or process pool created once per `AsyncTransliterator`, so the compiled
+pipeline is reused across calls. A concurrency limit bounds the work in flight: further calls wait in the event loop
+instead of piling up in the executor queue.
+
+    async with AsyncTransliterator(max_concurrency=8, timeout=2.0) as transliterator:
+        text = await transliterator.atransliterate('Dnia 12.12.2023 roku')
+"""
+import asyncio
+import itertools
+import os
+from collections import deque
+from concurrent.futures import Executor
+
+from polish_transliterate.core import PolishTransliterate
+
+
+async def _chunks(texts, chunksize):
+    # lists of up to `chunksize` texts from a sync or async iterable, consumed lazily
+    if hasattr(texts, '__aiter__'):
+        chunk = []
+        async for text in texts:
+            chunk.append(text)
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    else:
+        it = iter(texts)
+        while True:
+            chunk = list(itertools.islice(it, chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+
+class AsyncTransliterator:
+    """
+    Non-blocking `atransliterate` / `atransliterate_many` on top of `PolishTransliterate`
+    """
+
+    def __init__(self, transliterator=None, workers=None, executor='thread', max_concurrency=None, timeout=None,
+                 **options):
+        """
+        Constructor
+
+        :param transliterator: PolishTransliterate to use, otherwise one is created from `options`
+        :param workers: number of pool workers, defaults to the number of CPUs
+        :param executor: 'thread', 'process' or a `concurrent.futures.Executor` (not shut down by `close`)
+        :param max_concurrency: maximum number of calls (chunks for `atransliterate_many`) in flight,
+                                defaults to 2 * workers
+        :param timeout: default timeout in seconds per call, None for no timeout
+        :param options: keyword arguments for `PolishTransliterate`
+        """
+        if transliterator is None:
+            transliterator = PolishTransliterate(**options)
+        self.transliterator = transliterator
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or 2 * self.workers
+        self.timeout = timeout
+
+        if isinstance(executor, Executor):
+            self._pool, self._work, self._owns_pool = executor, transliterator._transliterate_list, False
+        else:
+            self._pool, self._work = transliterator._make_pool(self.workers, executor)
+            self._owns_pool = True
+        # created on first use, inside the running event loop
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """
+        Shuts the worker pool down, cancelling queued work
+        """
+        if self._owns_pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, texts):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await asyncio.wrap_future(self._pool.submit(self._work, texts))
+
+    async def _call(self, texts, timeout):
+        # the timeout includes waiting for a free slot; on timeout or cancellation queued work is dropped,
+        # work already running in a thread finishes in the background
+        timeout = self.timeout if timeout is None else timeout
+        if timeout is None:
+            return await self._run(texts)
+        return await asyncio.wait_for(self._run(texts), timeout)
+
+    async def atransliterate(self, text, timeout=None):
+        """
+        Transliterates `text` in the worker pool
+
+        :param text:
+        :param timeout: seconds, overrides the default timeout; raises asyncio.TimeoutError when exceeded
+        :return: str
+        """
+        return (await self._call([text], timeout))[0]
+
+    async def atransliterate_many(self, texts, chunksize=64, timeout=None):
+        """
+        Transliterates a (sync or async) iterable of texts, yielding the results in input order
+
+        The input is consumed lazily, at most `max_concurrency` chunks are in flight at any time.
+
+        :param texts: iterable or async iterable of strings
+        :param chunksize: number of texts sent to a worker at once
+        :param timeout: seconds per chunk, overrides the default timeout
+        :return: async generator of transliterated strings
+        """
+        pending = deque()
+        try:
+            async for chunk in _chunks(texts, chunksize):
+                pending.append(asyncio.ensure_future(self._call(chunk, timeout)))
+                if len(pending) >= self.max_concurrency:
+                    for result in await pending.popleft():
+                        yield result
+            while pending:
+                for result in await pending.popleft():
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,169 @@
+"""
+Source-to-output offset alignment for `PolishTransliterate.transliterate_with_alignment`
+
+Every rewriting stage of the pipeline reports the spans it replaced; the stage maps are composed as they come in,
+so no diff between input and output is needed. The result is a list of segments, each mapping an output span to
+the input span it came from: copied segments map character by character, replaced segments (e.g. a date expanded
+to words) map as a whole.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+def _append(segments, seg):
+    # merge adjacent copied segments
+    if segments and seg[4]:
+        last = segments[-1]
+        if last[4] and last[1] == seg[0] and last[3] == seg[2]:
+            segments[-1] = (last[0], seg[1], last[2], seg[3], True)
+            return
+    segments.append(seg)
+
+
+def _map_start(segments, starts, p, out_len, in_len):
+    if p >= out_len:
+        return in_len
+    i = bisect_right(starts, p) - 1
+    while segments[i][1] <= p:
+        i += 1
+    out_start, _, in_start, _, copied = segments[i]
+    return in_start + (p - out_start) if copied else in_start
+
+
+def _map_end(segments, starts, p):
+    if p <= 0:
+        return 0
+    i = bisect_left(starts, p) - 1
+    out_start, _, in_start, in_end, copied = segments[i]
+    return in_start + (p - out_start) if copied else in_end
+
+
+class AlignmentBuilder:
+    """
+    Composes the span maps of consecutive rewriting stages into one output-to-source map
+    """
+
+    def __init__(self, source_length):
+        self.source_length = source_length
+        self.length = source_length
+        # (out_start, out_end, in_start, in_end, copied), covering the current text contiguously
+        self.segments = [(0, source_length, 0, source_length, True)]
+
+    def _push(self, stage, length):
+        # stage: segments mapping the new text to the current one
+        a = self.segments
+        starts = [seg[0] for seg in a]
+        result = []
+        for out_start, out_end, in_start, in_end, copied in stage:
+            if copied:
+                i = max(bisect_right(starts, in_start) - 1, 0)
+                while i < len(a) and a[i][0] < in_end:
+                    a_out_start, a_out_end, a_in_start, a_in_end, a_copied = a[i]
+                    lo, hi = max(in_start, a_out_start), min(in_end, a_out_end)
+                    if lo < hi:
+                        if a_copied:
+                            _append(result, (out_start + lo - in_start, out_start + hi - in_start,
+                                             a_in_start + lo - a_out_start, a_in_start + hi - a_out_start, True))
+                        else:
+                            _append(result, (out_start + lo - in_start, out_start + hi - in_start,
+                                             a_in_start, a_in_end, False))
+                    i += 1
+            else:
+                lo = _map_start(a, starts, in_start, self.length, self.source_length)
+                hi = _map_end(a, starts, in_end) if in_end > in_start else lo
+                result.append((out_start, out_end, lo, max(lo, hi), False))
+        self.segments = result
+        self.length = length
+
+    def add_spans(self, length, spans):
+        """
+        Records a stage which replaced (start, end, replacement) spans of a text of `length` characters
+        """
+        if not spans:
+            return
+        stage = []
+        out = last = 0
+        for start, end, replacement in spans:
+            if start > last:
+                stage.append((out, out + start - last, last, start, True))
+                out += start - last
+            stage.append((out, out + len(replacement), start, end, False))
+            out += len(replacement)
+            last = end
+        if length > last:
+            stage.append((out, out + length - last, last, length, True))
+            out += length - last
+        self._push(stage, out)
+
+    def add_tokens(self, text, tokens):
+        """
+        Records the word stage: `tokens` (see `core.Tokens`) of `text`, joined with single spaces
+        """
+        stage = []
+        out = 0
+        prev_end = 0
+        for i, word in enumerate(tokens.words):
+            start, end = tokens.starts[i], tokens.ends[i]
+            if i:
+                # the separator stands for the whole gap between the tokens
+                stage.append((out, out + 1, prev_end, start, start - prev_end == 1))
+                out += 1
+            elif start:
+                stage.append((out, out, 0, start, False))
+            stage.append((out, out + len(word), start, end, word == text[start:end]))
+            out += len(word)
+            prev_end = end
+        if prev_end < len(text):
+            stage.append((out, out, prev_end, len(text), False))
+        self._push(stage, out)
+
+    def build(self):
+        return Alignment(self.segments, self.length, self.source_length)
+
+
+class Alignment:
+    """
+    Output-to-source offset map, stored as parallel arrays of segments
+    """
+
+    __slots__ = ('out_starts', 'out_ends', 'in_starts', 'in_ends', 'copied', 'length', 'source_length')
+
+    def __init__(self, segments, length, source_length):
+        self.out_starts = array('l', (seg[0] for seg in segments))
+        self.out_ends = array('l', (seg[1] for seg in segments))
+        self.in_starts = array('l', (seg[2] for seg in segments))
+        self.in_ends = array('l', (seg[3] for seg in segments))
+        self.copied = bytearray(seg[4] for seg in segments)
+        self.length = length
+        self.source_length = source_length
+
+    def __len__(self):
+        return len(self.out_starts)
+
+    def __iter__(self):
+        """
+        Yields (out_start, out_end, in_start, in_end, copied) segments in output order
+        """
+        return zip(self.out_starts, self.out_ends, self.in_starts, self.in_ends, map(bool, self.copied))
+
+    def source_span(self, start, end):
+        """
+        Maps an output span to the input span it was produced from
+
+        :param start: output start offset
+        :param end: output end offset
+        :return: (in_start, in_end)
+        """
+        starts = self.out_starts
+        if start >= self.length:
+            lo = self.source_length
+        else:
+            i = bisect_right(starts, start) - 1
+            while self.out_ends[i] <= start:
+                i += 1
+            lo = self.in_starts[i] + (start - starts[i]) if self.copied[i] else self.in_starts[i]
+        if end <= start:
+            return lo, lo
+        i = bisect_left(starts, end) - 1
+        hi = self.in_starts[i] + (end - starts[i]) if self.copied[i] else self.in_ends[i]
+        return lo, max(lo, hi)
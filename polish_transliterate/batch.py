@@ -0,0 +1,131 @@
+"""
+Batch mode for corpora and notification streams with many (near-)identical sentences
+
+`BatchTransliterator.transliterate_batch` transliterates every distinct text of a batch once. With `templates=True`
+it also splits each text around its number slots (`DETECT_NUMBER`) at the nearest cuts where the pieces transliterate
+independently (see `streaming.SafeCuts`); dates, amounts and times (`DETECT_DATE`, `DETECT_CURRENCY`, ...) never
+straddle such a cut, so they end up in the slot's piece. The invariant skeleton of "Kwota wynosi 1000 zł, dziękujemy"
+and "Kwota wynosi 2500 zł, dziękujemy" is processed once, only the pieces holding the slot values run through the
+pipeline. Results are identical to `PolishTransliterate.transliterate`.
+"""
+from polish_transliterate.core import PolishTransliterate
+from polish_transliterate.streaming import SafeCuts, join_outputs, without_lexicon
+
+_DIGITS = frozenset('0123456789')
+
+
+class BatchTransliterator:
+    """
+    Deduplicating (and optionally template-aware) batch front end of `PolishTransliterate`
+    """
+
+    def __init__(self, transliterator=None, templates=False, **options):
+        """
+        Constructor
+
+        :param transliterator: PolishTransliterate to use, otherwise one is created from `options`
+        :param templates: if True, share the processing of the skeleton around number, date and amount slots
+        :param options: keyword arguments for `PolishTransliterate`
+        """
+        if transliterator is None:
+            transliterator = PolishTransliterate(**options)
+        self.transliterator = transliterator
+        self.templates = templates
+
+        # the lexicon runs on whole texts before they are split
+        self.lexicon, self._transliterator = without_lexicon(transliterator)
+        self._cuts = SafeCuts(self._transliterator)
+        self._detect_number = self._transliterator.regex.DETECT_NUMBER
+        self.clear()
+
+    def clear(self):
+        """
+        Resets the statistics
+        """
+        self._texts = self._unique_texts = self._pieces = self._unique_pieces = 0
+        self._chars = self._chars_transliterated = 0
+
+    def stats(self):
+        """
+        Returns deduplication statistics, accumulated over all batches
+
+        dedup_ratio is the share of the input characters which did not have to be transliterated.
+
+        :return: dict(texts, unique_texts, pieces, unique_pieces, chars, chars_transliterated, dedup_ratio)
+        """
+        return {'texts': self._texts, 'unique_texts': self._unique_texts, 'pieces': self._pieces,
+                'unique_pieces': self._unique_pieces, 'chars': self._chars,
+                'chars_transliterated': self._chars_transliterated,
+                'dedup_ratio': 1 - self._chars_transliterated / self._chars if self._chars else 0.0}
+
+    def transliterate_batch(self, texts):
+        """
+        Transliterates a batch of texts
+
+        :param texts: iterable of strings
+        :return: list of transliterated strings, in input order
+        """
+        results = {}
+        pieces = {}
+        output = []
+        for text in texts:
+            self._texts += 1
+            self._chars += len(text)
+            result = results.get(text)
+            if result is None:
+                self._unique_texts += 1
+                if self.templates:
+                    result = self._transliterate_pieces(text, pieces)
+                else:
+                    self._chars_transliterated += len(text)
+                    result = self.transliterator.transliterate(text)
+                results[text] = result
+            output.append(result)
+        return output
+
+    def _transliterate_pieces(self, text, memo):
+        if self.lexicon is not None:
+            text = self.lexicon.apply(text)
+        outputs = []
+        for piece in self.split(text):
+            self._pieces += 1
+            result = memo.get(piece)
+            if result is None:
+                self._unique_pieces += 1
+                self._chars_transliterated += len(piece)
+                result = memo[piece] = self._transliterator.transliterate(piece)
+            outputs.append(result)
+        return join_outputs(outputs)
+
+    def split(self, text):
+        """
+        Splits `text` into skeleton pieces and pieces holding its slots, at the safe cuts nearest to the slots
+
+        :param text: text after the lexicon stage
+        :return: list of str
+        """
+        if _DIGITS.isdisjoint(text):
+            return [text]
+        cuts = self._cuts
+        bounds = []
+        pos = 0
+        for m in self._detect_number.finditer(text):
+            if m.start() < pos:
+                # in the piece of the previous slot
+                continue
+            before = cuts.last(text, m.start())
+            if before is not None and before[1] > pos:
+                bounds.append(before)
+            after = cuts.first(text, m.end())
+            if after is None:
+                break
+            bounds.append(after)
+            pos = after[1]
+
+        pieces = []
+        pos = 0
+        for end, start in bounds:
+            pieces.append(text[pos:end])
+            pos = start
+        pieces.append(text[pos:])
+        return pieces
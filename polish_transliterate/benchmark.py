@@ -0,0 +1,369 @@
+"""
+Benchmark suite: synthetic Polish corpora stressing each op, throughput, latency percentiles and peak memory
+
+Results are written as JSON and can be compared against a stored baseline, failing (exit code 1) when a
+throughput drops (or the cold start time grows) by more than the given threshold, e.g.
+
+    python -m polish_transliterate.benchmark --output baseline.json
+    python -m polish_transliterate.benchmark --baseline baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from polish_transliterate.core import ENGINES, PolishTransliterate, Tokens
+
+WORDS = ('dzień', 'dobry', 'bardzo', 'proszę', 'dziękuję', 'który', 'wszystko', 'przez', 'jeszcze', 'również',
+         'został', 'miasto', 'kraju', 'rząd', 'prezydent', 'firma', 'sprawa', 'ludzie', 'zawsze', 'można',
+         'pieniądze', 'według', 'gdzie', 'teraz', 'jednak', 'spotkanie', 'roku', 'wiele', 'kilka', 'pracy',
+         'źródło', 'żółw', 'gęś', 'łódź', 'szkoła', 'ulica', 'sklep', 'samochód', 'pociąg', 'lotnisko')
+ACRONYMS = ('NATO', 'PZU', 'PKP', 'PKO', 'ZUS', 'NBP', 'GUS', 'UE', 'USA', 'ONZ', 'U.S.A.', 'A.B.C.')
+CURRENCIES = ('PLN', 'USD', 'EUR', 'GBP', 'CHF')
+MAGNITUDES = ('', '', 'mln', 'mld', 'tysiąc')
+MONTHS = ('styczeń', 'luty', 'marzec', 'kwiecień', 'maj', 'czerwiec', 'lipiec', 'sierpień', 'wrzesień', 'październik',
+          'listopad', 'grudzień')
+FRACTIONS = ('1/2', '1/3', '3/4', '½', '⅓', '¼', '5-10', '+/-3')
+
+
+def _capitalize(text):
+    # unlike str.capitalize() keeps acronyms and currency codes uppercase
+    return text[:1].upper() + text[1:]
+
+
+def _prose(rnd, n):
+    return ' '.join(rnd.choice(WORDS) for _ in range(n))
+
+
+def _date(rnd):
+    day, month, year = rnd.randint(1, 28), rnd.randint(1, 12), rnd.randint(1950, 2030)
+    style = rnd.randrange(4)
+    if style == 0:
+        return '%d.%02d.%d' % (day, month, year)
+    if style == 1:
+        return '%d.%d.%02d' % (day, month, year % 100)
+    if style == 2:
+        return '%d.%s %d' % (day, rnd.choice(MONTHS), year)
+    return '%d.%d.' % (day, month)
+
+
+def _amount(rnd):
+    number = str(rnd.randint(1, 100000))
+    if rnd.random() < 0.4:
+        number += ',%02d' % rnd.randint(0, 99)
+    magnitude = rnd.choice(MAGNITUDES)
+    if magnitude:
+        number += ' ' + magnitude
+    return number + ' ' + rnd.choice(CURRENCIES)
+
+
+def _timestamp(rnd):
+    style = rnd.randrange(3)
+    if style == 0:
+        return '%d:%02d:%02d' % (rnd.randint(0, 99), rnd.randint(0, 59), rnd.randint(0, 59))
+    if style == 1:
+        return '%dh:%02dm' % (rnd.randint(0, 23), rnd.randint(0, 59))
+    return 'o %d:%02d' % (rnd.randint(0, 23), rnd.randint(0, 59))
+
+
+def _sentence(rnd, make_term):
+    # a few plain words around each generated term
+    parts = [_prose(rnd, rnd.randint(2, 6))]
+    for _ in range(rnd.randint(1, 3)):
+        parts.append(make_term(rnd))
+        parts.append(_prose(rnd, rnd.randint(1, 4)))
+    return _capitalize(' '.join(parts) + '.')
+
+
+CORPORA = {
+    'dates': lambda rnd: _sentence(rnd, _date),
+    'money': lambda rnd: _sentence(rnd, _amount),
+    'acronyms': lambda rnd: _sentence(rnd, lambda r: r.choice(ACRONYMS)),
+    'fractions': lambda rnd: _sentence(rnd, lambda r: r.choice(FRACTIONS)),
+    'timestamps': lambda rnd: _sentence(rnd, _timestamp),
+    'prose': lambda rnd: _capitalize(_prose(rnd, rnd.randint(8, 30)) + '.'),
+    'mixed': lambda rnd: _sentence(rnd, lambda r: r.choice((_date, _amount, _timestamp,
+                                                            lambda q: q.choice(ACRONYMS + FRACTIONS)))(r)),
+}
+
+# op -> (corpus stressing it, whether the op runs after the acronym and lowercase stage, call of the op on one
+# sentence); the word loop runs on the fractions corpus, which has no dates, amounts or times it would only see
+# expanded in the pipeline
+OPS = {
+    'acronym_phoneme': ('acronyms', False, lambda t, text: t._acronym_phoneme_op(text)),
+    'accent_peculiarity': ('prose', True, lambda t, text: t._accent_peculiarity_op(text)),
+    'amount_money': ('money', True, lambda t, text: t._amount_money_op(text)),
+    'date': ('dates', True, lambda t, text: t._date_op(text)),
+    'timestamp': ('timestamps', True, lambda t, text: t._timestamp_op(text)),
+    'time_of_day': ('timestamps', True, lambda t, text: t._timeofday_op(text)),
+    'words': ('fractions', True, lambda t, text: t._transliterate_words(Tokens(text))),
+    # the single pass of the merged engine over the amount, date and time detectors (sequential: all four ops)
+    'text_ops': ('mixed', True, lambda t, text: t._merged_text_ops(text) if t.pipeline.merged_detector is not None
+                 else t._timeofday_op(t._timestamp_op(t._date_op(t._amount_money_op(text))))),
+}
+
+
+def _after_acronyms(transliterator, text):
+    # the text as the ops after the acronym and lowercase stage see it
+    if 'acronym_phoneme' in transliterator.transliterate_ops:
+        text = transliterator._acronym_phoneme_op(text)
+    else:
+        text = transliterator._mask_acronym(text)
+    return text.lower() if transliterator.make_lowercase else text
+
+
+# metrics compared against a baseline (higher is better)
+THROUGHPUT_METRICS = ('sentences_per_s', 'mb_per_s')
+# cold start metrics compared against a baseline (lower is better)
+STARTUP_METRICS = ('import_ms', 'construct_ms', 'first_call_ms')
+
+# run in a fresh interpreter per measurement, nothing may be imported or compiled beforehand
+_STARTUP_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+from polish_transliterate.core import PolishTransliterate
+imported = time.perf_counter()
+transliterator = PolishTransliterate()
+constructed = time.perf_counter()
+transliterator.transliterate(sys.argv[1])
+called = time.perf_counter()
+print(json.dumps({'import_ms': (imported - start) * 1e3, 'construct_ms': (constructed - imported) * 1e3,
+                  'first_call_ms': (called - constructed) * 1e3, 'modules': len(sys.modules)}))
+'''
+
+
+def generate(corpus, sentences=2000, seed=0):
+    """
+    Generates a synthetic corpus
+
+    :param corpus: name, see `CORPORA`
+    :param sentences: number of sentences
+    :param seed: random seed, the same seed gives the same corpus
+    :return: list of str
+    """
+    rnd = random.Random('%s:%d' % (corpus, seed))
+    make = CORPORA[corpus]
+    return [make(rnd) for _ in range(sentences)]
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def measure(func, texts, repeat=3):
+    """
+    Calls `func` on every text, `repeat` times, and measures throughput (best run), latency and peak memory
+
+    :param func: callable taking one text
+    :param texts: list of str
+    :param repeat: number of timed runs
+    :return: dict
+    """
+    n_bytes = sum(len(text.encode('utf-8')) for text in texts)
+    best = float('inf')
+    latencies = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        run = []
+        start = clock()
+        for text in texts:
+            t0 = clock()
+            func(text)
+            run.append(clock() - t0)
+        elapsed = (clock() - start) / 1e9
+        if elapsed < best:
+            best, latencies = elapsed, run
+
+    # separate untimed run, tracemalloc slows allocations down
+    tracemalloc.start()
+    try:
+        for text in texts:
+            func(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    best = max(best, 1e-9)
+    return {
+        'sentences': len(texts),
+        'seconds': best,
+        'sentences_per_s': len(texts) / best,
+        'mb_per_s': n_bytes / 1e6 / best,
+        'latency_us': {name: _percentile(latencies, q) / 1e3
+                       for name, q in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))},
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def measure_startup(runs=5, text='Dzień dobry, spotkanie jest 12.05.2024 o 10:30.'):
+    """
+    Measures the cold start: import of `polish_transliterate.core`, construction of a default `PolishTransliterate`
+    and its first call, each in a fresh interpreter
+
+    :param runs: number of interpreters started, the median of each metric counts
+    :param text: text of the first call
+    :return: dict(runs, import_ms, construct_ms, first_call_ms, total_ms, modules)
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', _STARTUP_SCRIPT, text], check=True, capture_output=True,
+                                text=True).stdout
+        samples.append(json.loads(output))
+    result = {'runs': runs}
+    for metric in STARTUP_METRICS + ('modules',):
+        result[metric] = _percentile(sorted(sample[metric] for sample in samples), 0.5)
+    result['total_ms'] = sum(result[metric] for metric in STARTUP_METRICS)
+    return result
+
+
+def run(sentences=2000, repeat=3, corpora=None, ops=None, seed=0, transliterator=None, startup_runs=5,
+        engine='sequential'):
+    """
+    Runs the suite
+
+    :param sentences: sentences per corpus
+    :param repeat: timed runs per measurement
+    :param corpora: corpus names for the end-to-end measurements, defaults to all
+    :param ops: op names for the per-op measurements, defaults to all
+    :param seed: random seed of the corpora
+    :param transliterator: PolishTransliterate to measure, defaults to one with all ops
+    :param startup_runs: interpreters started for the cold start measurement, 0 to skip it
+    :param engine: engine of the default transliterator (see `PolishTransliterate`)
+    :return: dict, JSON serializable
+    """
+    if transliterator is None:
+        transliterator = PolishTransliterate(transliterate_ops=['acronym_phoneme', 'accent_peculiarity',
+                                                                'amount_money', 'date', 'timestamp', 'time_of_day',
+                                                                'ordinal', 'special', 'weekday', 'month',
+                                                                'math_symbol'], engine=engine)
+    corpora = list(CORPORA) if corpora is None else corpora
+    ops = list(OPS) if ops is None else ops
+    texts = {}
+
+    def corpus(name):
+        if name not in texts:
+            texts[name] = generate(name, sentences, seed)
+        return texts[name]
+
+    results = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'sentences': sentences,
+        'repeat': repeat,
+        'seed': seed,
+        'engine': transliterator.pipeline.engine,
+        'end_to_end': {},
+        'ops': {},
+    }
+    for name in corpora:
+        results['end_to_end'][name] = measure(transliterator.transliterate, corpus(name), repeat)
+    for op in ops:
+        name, after_acronyms, call = OPS[op]
+        op_texts = [_after_acronyms(transliterator, text) for text in corpus(name)] if after_acronyms \
+            else corpus(name)
+        results['ops'][op] = dict(measure(lambda text: call(transliterator, text), op_texts, repeat), corpus=name)
+    if startup_runs:
+        results['startup'] = measure_startup(startup_runs)
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Compares throughputs and cold start times against a baseline
+
+    :param results: dict returned by `run`
+    :param baseline: dict returned by an earlier `run`
+    :param threshold: allowed relative drop, e.g. 0.1 for 10%
+    :return: list of (section, name, metric, baseline value, value, relative change) of the regressions
+    """
+    regressions = []
+    for section in ('end_to_end', 'ops'):
+        for name, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if previous is None:
+                continue
+            for metric in THROUGHPUT_METRICS:
+                if not previous.get(metric):
+                    continue
+                change = current[metric] / previous[metric] - 1
+                if change < -threshold:
+                    regressions.append((section, name, metric, previous[metric], current[metric], change))
+    current, previous = results.get('startup'), baseline.get('startup')
+    if current and previous:
+        for metric in STARTUP_METRICS:
+            if not previous.get(metric):
+                continue
+            change = current[metric] / previous[metric] - 1
+            if change > threshold:
+                regressions.append(('startup', 'cold', metric, previous[metric], current[metric], change))
+    return regressions
+
+
+def _print_summary(results, file):
+    print('%-24s %12s %8s %10s %10s %10s %10s' % ('', 'sentences/s', 'MB/s', 'p50 us', 'p99 us', 'max us',
+                                                  'peak KB'), file=file)
+    for section in ('end_to_end', 'ops'):
+        for name, r in results[section].items():
+            latency = r['latency_us']
+            print('%-24s %12.0f %8.2f %10.1f %10.1f %10.1f %10.0f'
+                  % ((section + ':' + name)[:24], r['sentences_per_s'], r['mb_per_s'], latency['p50'],
+                     latency['p99'], latency['max'], r['peak_memory_kb']), file=file)
+    startup = results.get('startup')
+    if startup:
+        print('startup: import %.1f ms, construct %.1f ms, first call %.1f ms, %d modules'
+              % (startup['import_ms'], startup['construct_ms'], startup['first_call_ms'], startup['modules']),
+              file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m polish_transliterate.benchmark',
+                                     description='Benchmark PolishTransliterate on synthetic Polish corpora.')
+    parser.add_argument('--sentences', type=int, default=2000, help='sentences per corpus (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs, the best one counts (default: %(default)s)')
+    parser.add_argument('--corpora', default=','.join(CORPORA),
+                        help='comma separated end-to-end corpora (default: %(default)s)')
+    parser.add_argument('--ops', default=','.join(OPS), help='comma separated per-op benchmarks (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the corpora')
+    parser.add_argument('--engine', choices=ENGINES, default='sequential',
+                        help='engine of the text-level ops (default: %(default)s)')
+    parser.add_argument('--startup-runs', type=int, default=5,
+                        help='fresh interpreters for the cold start measurement, 0 to skip (default: %(default)s)')
+    parser.add_argument('-o', '--output', default=None, help='write the results as JSON to this file')
+    parser.add_argument('--baseline', default=None, help='JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed relative throughput drop (or startup time increase) against the baseline '
+                             '(default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    results = run(sentences=args.sentences, repeat=args.repeat,
+                  corpora=[name for name in args.corpora.split(',') if name],
+                  ops=[op for op in args.ops.split(',') if op], seed=args.seed, startup_runs=args.startup_runs,
+                  engine=args.engine)
+    _print_summary(results, sys.stderr)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for section, name, metric, previous, current, change in regressions:
+            print('REGRESSION %s:%s %s: %.2f -> %.2f (%+.1f%%)' % (section, name, metric, previous, current,
+                                                                  100 * change), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
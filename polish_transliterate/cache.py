@@ -0,0 +1,321 @@
+"""
+Result caches for `PolishTransliterate(cache=...)`
+
+Repetitive traffic (UI prompts, IVR menus, notification templates) can skip the pipeline entirely: results are
+cached under a namespace identifying the transliterator setup (ops, replacements, config file, lexicon) and the
+input text. `MemoryCache` is an in-process LRU cache, `SqliteCache` a store on disk shared by all processes on
+the host (e.g. the workers of `transliterate_many`). Other backends implement the `ResultCache` interface.
+"""
+import abc
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache(abc.ABC):
+    """
+    Interface of result cache backends
+    """
+
+    @abc.abstractmethod
+    def get(self, namespace, text):
+        """
+        Looks up a cached result
+
+        :param namespace: str identifying the transliterator setup
+        :param text: input text
+        :return: str, or None on a miss
+        """
+
+    @abc.abstractmethod
+    def set(self, namespace, text, result):
+        """
+        Stores a result
+
+        :param namespace: str identifying the transliterator setup
+        :param text: input text
+        :param result: transliterated text
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+        pass
+
+    @abc.abstractmethod
+    def stats(self):
+        """
+        Returns hit/miss statistics
+
+        :return: dict with at least hits, misses and hit_rate
+        """
+
+    def close(self):
+        """
+        Releases the resources held by the backend (e.g. database connections)
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _hit_rate(hits, misses):
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def _size(text, result):
+    # what `max_bytes` limits: the UTF-8 size of the cached text and result
+    return len(text.encode('utf-8', 'surrogatepass')) + len(result.encode('utf-8', 'surrogatepass'))
+
+
+class MemoryCache(ResultCache):
+    """
+    Thread-safe in-process LRU cache with optional time-to-live and size limit in bytes
+    """
+
+    def __init__(self, maxsize=100000, max_bytes=None, ttl=None):
+        """
+        Constructor
+
+        :param maxsize: max. number of entries (None for unbounded)
+        :param max_bytes: max. total size of the cached texts and results in bytes, UTF-8 encoded (None for
+                          unbounded)
+        :param ttl: seconds after which an entry expires (None for never)
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def get(self, namespace, text):
+        key = namespace, text
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            result, size, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def set(self, namespace, text, result):
+        size = _size(text, result)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        key = namespace, text
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = result, size, expires
+            self._bytes += size
+            while (self.maxsize is not None and len(self._entries) > self.maxsize) \
+                    or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (_, old_size, _) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def stats(self):
+        """
+        Returns hit/miss statistics
+
+        :return: dict(hits, misses, hit_rate, evictions, expirations, size, bytes, maxsize, max_bytes)
+        """
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'hit_rate': _hit_rate(self._hits, self._misses),
+                    'evictions': self._evictions, 'expirations': self._expirations, 'size': len(self._entries),
+                    'bytes': self._bytes, 'maxsize': self.maxsize, 'max_bytes': self.max_bytes}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __reduce__(self):
+        # entries are process-local, a copy starts empty
+        return type(self), (self.maxsize, self.max_bytes, self.ttl)
+
+
+class _transaction:
+    # BEGIN IMMEDIATE ... COMMIT on a connection in autocommit mode, writers queue up instead of failing to upgrade
+    # a read lock
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute('COMMIT' if exc_type is None else 'ROLLBACK')
+
+
+class SqliteCache(ResultCache):
+    """
+    Cache in an SQLite database file, shared by all threads and processes using the same path
+
+    `max_bytes` is a hard limit: every write runs in one transaction with the eviction of the oldest entries it
+    takes to stay below it, using a running total of the entry sizes kept in the database by triggers. Statistics
+    other than size and bytes are per instance.
+    """
+
+    # how many writes (per instance) may pass between two purges of expired entries
+    CHECK_INTERVAL = 256
+
+    def __init__(self, path, max_bytes=None, ttl=None):
+        """
+        Constructor
+
+        :param path: database file, created if it does not exist
+        :param max_bytes: max. total size of the cached texts and results in bytes, UTF-8 encoded (None for
+                          unbounded)
+        :param ttl: seconds after which an entry expires (None for never)
+        """
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # (pid, connection) of every thread, so `close` reaches them all
+        self._connections = []
+        self._writes = 0
+        self._hits = self._misses = self._evictions = self._expirations = 0
+        self._connection()
+
+    def _connection(self):
+        # one connection per thread and process (connections must not cross a fork)
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            with _transaction(connection):
+                connection.execute('CREATE TABLE IF NOT EXISTS results (key BLOB PRIMARY KEY, value TEXT NOT NULL, '
+                                   'size INTEGER NOT NULL, expires REAL, created REAL NOT NULL)')
+                connection.execute('CREATE INDEX IF NOT EXISTS results_created ON results (created)')
+                # running total of the sizes, so the limit is checked without summing up all entries
+                connection.execute('CREATE TABLE IF NOT EXISTS total (id INTEGER PRIMARY KEY CHECK (id = 0), '
+                                   'bytes INTEGER NOT NULL)')
+                connection.execute('INSERT OR IGNORE INTO total VALUES (0, (SELECT COALESCE(SUM(size), 0) '
+                                   'FROM results))')
+                connection.execute('CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results '
+                                   'BEGIN UPDATE total SET bytes = bytes + NEW.size; END')
+                connection.execute('CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results '
+                                   'BEGIN UPDATE total SET bytes = bytes - OLD.size; END')
+            local.connection, local.pid = connection, os.getpid()
+            with self._lock:
+                self._connections.append((local.pid, connection))
+        return local.connection
+
+    def close(self):
+        """
+        Closes the connections of all threads of this process; the cache reconnects when used again
+        """
+        pid = os.getpid()
+        with self._lock:
+            # connections inherited over a fork belong to the parent
+            connections = [connection for owner, connection in self._connections if owner == pid]
+            self._connections = []
+            self._local = threading.local()
+        for connection in connections:
+            connection.close()
+
+    @staticmethod
+    def _key(namespace, text):
+        return hashlib.blake2b((namespace + '\0' + text).encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, namespace, text):
+        connection = self._connection()
+        key = self._key(namespace, text)
+        row = connection.execute('SELECT value, expires FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self._count('_misses')
+            return None
+        value, expires = row
+        if expires is not None and expires < time.time():
+            connection.execute('DELETE FROM results WHERE key = ?', (key,))
+            self._count('_expirations')
+            self._count('_misses')
+            return None
+        self._count('_hits')
+        return value
+
+    def set(self, namespace, text, result):
+        size = _size(text, result)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        now = time.time()
+        key = self._key(namespace, text)
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % self.CHECK_INTERVAL == 0
+        connection = self._connection()
+        with _transaction(connection):
+            if purge:
+                connection.execute('DELETE FROM results WHERE expires IS NOT NULL AND expires < ?', (now,))
+            # no INSERT OR REPLACE, its implicit delete does not fire the trigger keeping the total
+            connection.execute('DELETE FROM results WHERE key = ?', (key,))
+            connection.execute('INSERT INTO results (key, value, size, expires, created) VALUES (?, ?, ?, ?, ?)',
+                               (key, result, size, now + self.ttl if self.ttl is not None else None, now))
+            if self.max_bytes is not None:
+                self._shrink(connection)
+
+    def _shrink(self, connection):
+        # evicts the oldest entries until the limit holds, within the transaction of the write exceeding it
+        excess = connection.execute('SELECT bytes FROM total').fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        keys = []
+        for key, size in connection.execute('SELECT key, size FROM results ORDER BY created'):
+            keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany('DELETE FROM results WHERE key = ?', keys)
+        with self._lock:
+            self._evictions += len(keys)
+
+    def clear(self):
+        self._connection().execute('DELETE FROM results')
+        with self._lock:
+            self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def stats(self):
+        """
+        Returns hit/miss statistics
+
+        :return: dict(hits, misses, hit_rate, evictions, expirations, size, bytes, max_bytes)
+        """
+        size, total = self._connection().execute('SELECT (SELECT COUNT(*) FROM results), bytes FROM total').fetchone()
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'hit_rate': _hit_rate(self._hits, self._misses),
+                    'evictions': self._evictions, 'expirations': self._expirations, 'size': size,
+                    'bytes': total, 'max_bytes': self.max_bytes}
+
+    def __reduce__(self):
+        # a copy opens its own connections to the same database
+        return type(self), (self.path, self.max_bytes, self.ttl)
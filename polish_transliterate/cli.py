@@ -0,0 +1,251 @@
+"""
+Command-line interface for corpus-scale preprocessing
+
+Streams text line by line from stdin or files (plain, .gz, .bz2, .xz) and writes the transliterated lines
+to stdout or a file, e.g.
+
+    python -m polish_transliterate.cli --jobs 8 -o out.txt.gz corpus_1.txt.gz corpus_2.txt.xz
+    python -m polish_transliterate.cli --jsonl --field text < data.jsonl > data_normalized.jsonl
+
+With --document every input is one document, transliterated in memory-bounded windows (see
+`polish_transliterate.document`) and written as one line.
+"""
+import argparse
+import bz2
+import gzip
+import itertools
+import json
+import lzma
+import sys
+import time
+
+from polish_transliterate.core import ENGINES, PolishTransliterate
+
+DEFAULT_OPS = ['accent_peculiarity', 'amount_money', 'date', 'timestamp', 'time_of_day', 'ordinal', 'special']
+
+_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+WRITE_BATCH = 1024
+
+
+def _open(path, mode):
+    """
+    Opens a (possibly compressed, by file extension) file in binary mode, '-' maps to stdin/stdout
+    """
+    if path == '-':
+        return (sys.stdin if 'r' in mode else sys.stdout).buffer
+    for ext, opener in _OPENERS.items():
+        if path.endswith(ext):
+            return opener(path, mode)
+    return open(path, mode, buffering=1 << 20)
+
+
+class _Counter:
+    def __init__(self):
+        self.lines = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+
+class _CountingReader:
+    def __init__(self, f, counter):
+        self._f = f
+        self._counter = counter
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        self._counter.bytes_in += len(data)
+        return data
+
+
+def _read_lines(paths, counter):
+    for path in paths:
+        f = _open(path, 'rb')
+        try:
+            for raw in f:
+                counter.lines += 1
+                counter.bytes_in += len(raw)
+                yield raw.decode('utf-8').rstrip('\r\n')
+        finally:
+            if f is not sys.stdin.buffer:
+                f.close()
+
+
+def _executor(args):
+    # the profiler collects in-process only, so profiled runs use threads
+    return 'thread' if args.profile else None
+
+
+def _transliterate_plain(transliterator, lines, args):
+    return transliterator.transliterate_many(lines, workers=args.jobs, chunksize=args.chunksize,
+                                             executor=_executor(args))
+
+
+def _parse_jsonl(lines, field):
+    # (record, line, whether record[field] is transliterated) for the non-empty lines
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            print('line %d: invalid JSON (%s), passed through unchanged' % (number, e), file=sys.stderr)
+            yield None, line, False
+            continue
+        yield record, line, isinstance(record, dict) and isinstance(record.get(field), str)
+
+
+def _transliterate_jsonl(transliterator, lines, args):
+    records, texts = itertools.tee(_parse_jsonl(lines, args.field))
+    texts = (record[args.field] for record, _, transliterated in texts if transliterated)
+    results = transliterator.transliterate_many(texts, workers=args.jobs, chunksize=args.chunksize,
+                                                executor=_executor(args))
+    for record, line, transliterated in records:
+        if not isinstance(record, dict):
+            # not a JSON object: there is no field to transliterate
+            yield line
+            continue
+        if transliterated:
+            record[args.output_field or args.field] = next(results)
+        yield json.dumps(record, ensure_ascii=False)
+
+
+def _write_documents(transliterator, args, out, counter):
+    from polish_transliterate.document import DocumentTransliterator
+
+    document = DocumentTransliterator(transliterator, window=int(args.window * 1e6))
+    for path in args.inputs:
+        f = _open(path, 'rb')
+        try:
+            counter.lines += 1
+            for output in document.transliterate_windows(document.read_windows(_CountingReader(f, counter))):
+                data = output.encode('utf-8')
+                counter.bytes_out += len(data)
+                out.write(data)
+            counter.bytes_out += 1
+            out.write(b'\n')
+        finally:
+            if f is not sys.stdin.buffer:
+                f.close()
+    return document.stats()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m polish_transliterate.cli',
+                                     description='Transliterate (normalize) Polish text for TTS, line by line.')
+    parser.add_argument('inputs', nargs='*', default=['-'],
+                        help="input files (.gz, .bz2 and .xz are decompressed), '-' or none for stdin")
+    parser.add_argument('-o', '--output', default='-',
+                        help="output file (compressed by extension), '-' or none for stdout")
+    parser.add_argument('--ops', default=','.join(DEFAULT_OPS),
+                        help='comma separated list of transliterate ops (default: %(default)s)')
+    parser.add_argument('--sep-abbreviation', default=' ', help='separator for abbreviations')
+    parser.add_argument('--no-lowercase', action='store_true', help='do not make the text lowercase')
+    parser.add_argument('--engine', choices=ENGINES, default='sequential',
+                        help='run the amount, date and time ops one after another or in one merged pass '
+                             '(default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='number of parallel workers (default: 1)')
+    parser.add_argument('--chunksize', type=int, default=256, help='lines sent to a worker at once')
+    parser.add_argument('--jsonl', action='store_true',
+                        help='input is JSON lines, transliterate FIELD and keep the other fields')
+    parser.add_argument('--document', action='store_true',
+                        help='transliterate every input as one document (line breaks collapse to spaces) in '
+                             'memory-bounded windows, see --window')
+    parser.add_argument('--window', type=float, default=1.0, metavar='MB',
+                        help='window size of --document in MB (default: %(default)s)')
+    parser.add_argument('--field', default='text', help='JSON field to transliterate (default: %(default)s)')
+    parser.add_argument('--output-field', default=None,
+                        help='JSON field to write the result to (default: overwrite FIELD)')
+    parser.add_argument('--cache', default=None, metavar='FILE',
+                        help='cache results in an SQLite database shared by the workers (and later runs)')
+    parser.add_argument('--cache-size', type=float, default=None, metavar='MB',
+                        help='max. size of the cached texts and results in MB (default: unbounded)')
+    parser.add_argument('--profile', action='store_true',
+                        help='print a per-op time breakdown and skip counts on stderr '
+                             '(parallel jobs run as threads)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not report throughput on stderr')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.document and args.jsonl:
+        parser.error('--document and --jsonl are mutually exclusive')
+    ops = [op.strip() for op in args.ops.split(',') if op.strip()]
+    cache = None
+    if args.cache:
+        from polish_transliterate.cache import SqliteCache
+        cache = SqliteCache(args.cache, max_bytes=int(args.cache_size * 1e6) if args.cache_size else None)
+    profiler = None
+    if args.profile:
+        from polish_transliterate.profiling import Profiler
+        profiler = Profiler()
+    transliterator = PolishTransliterate(transliterate_ops=ops,
+                                         sep_abbreviation=args.sep_abbreviation,
+                                         make_lowercase=not args.no_lowercase,
+                                         cache=cache,
+                                         profiler=profiler,
+                                         engine=args.engine)
+
+    counter = _Counter()
+    document_stats = None
+    start = time.perf_counter()
+    out = _open(args.output, 'wb')
+    try:
+        if args.document:
+            document_stats = _write_documents(transliterator, args, out, counter)
+        else:
+            lines = _read_lines(args.inputs, counter)
+            if args.jsonl:
+                results = _transliterate_jsonl(transliterator, lines, args)
+            else:
+                results = _transliterate_plain(transliterator, lines, args)
+            batch = []
+            for result in results:
+                batch.append(result)
+                if len(batch) >= WRITE_BATCH:
+                    data = ('\n'.join(batch) + '\n').encode('utf-8')
+                    counter.bytes_out += len(data)
+                    out.write(data)
+                    batch = []
+            if batch:
+                data = ('\n'.join(batch) + '\n').encode('utf-8')
+                counter.bytes_out += len(data)
+                out.write(data)
+    finally:
+        if out is sys.stdout.buffer:
+            out.flush()
+        else:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    if not args.quiet:
+        elapsed = max(elapsed, 1e-9)
+        unit = 'documents' if args.document else 'lines'
+        print('%d %s, %.1f MB in, %.1f MB out in %.2fs: %.0f %s/s, %.2f MB/s'
+              % (counter.lines, unit, counter.bytes_in / 1e6, counter.bytes_out / 1e6, elapsed,
+                 counter.lines / elapsed, unit, counter.bytes_in / 1e6 / elapsed), file=sys.stderr)
+        if document_stats is not None and document_stats['forced_cuts']:
+            print('document: %d windows, %d forced cuts (no safe cut within the window)'
+                  % (document_stats['windows'], document_stats['forced_cuts']), file=sys.stderr)
+        if cache is not None and args.jobs <= 1:
+            stats = cache.stats()
+            print('cache: %d hits, %d misses (%.1f%%), %d entries, %.1f MB'
+                  % (stats['hits'], stats['misses'], 100 * stats['hit_rate'], stats['size'], stats['bytes'] / 1e6),
+                  file=sys.stderr)
+    if profiler is not None:
+        profiler.report(sys.stderr)
+        stats = transliterator.skip_stats()
+        print('ops skipped by character profile (of %d texts): %s'
+              % (stats['texts'], ', '.join('%s %d' % item for item in sorted(stats['skipped'].items())) or 'none'),
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
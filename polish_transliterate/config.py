@@ -0,0 +1,249 @@
+"""
+External language data for the transliteration configs
+
+The tables of the config classes in `core` (`UNICODE_TO_ASCII`, `LETTER`, `MISC`, `MONTH`, `SPECIAL_TRANSLITERATE`,
+...) can be customized with a JSON or TOML file instead of subclassing. Top-level table names replace the built-in
+table, tables in an `extend` section are merged into it, e.g.
+
+    {
+        "EXCLUDE": ["EU", "USA", "NATO"],
+        "extend": {"MISC": {"prof.": "profesor", "inż.": "inżynier"}}
+    }
+
+Loaded configs, including the tables derived from them, are cached in a binary file keyed by a hash of the file
+contents (and of the built-in tables), so workers with custom dictionaries skip parsing and deriving them. The cache
+can be built ahead of time with
+
+    python -m polish_transliterate.config my_config.toml
+"""
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+
+from polish_transliterate.core import PolishReplacementConfig, PolishAcronymPhonemeConfig, PolishUnitConfig, \
+    PolishAbbreviationConfig, RegExConfig, _build_accent_table, _build_misc_index
+
+FORMAT_VERSION = 1
+
+CONFIG_CLASSES = (PolishReplacementConfig, PolishAcronymPhonemeConfig, PolishUnitConfig, PolishAbbreviationConfig,
+                  RegExConfig)
+
+# table name -> config class it belongs to
+TABLES = {
+    'UNICODE_TO_ASCII': PolishReplacementConfig,
+    'EXCLUDE': PolishAcronymPhonemeConfig,
+    'LETTER': PolishAcronymPhonemeConfig,
+    'PLURAL_NO_SUFFIX': PolishUnitConfig,
+    'PLURAL_SUFFIX_N': PolishUnitConfig,
+    'PLURAL_SUFFIX_EN': PolishUnitConfig,
+    'MISC': PolishAbbreviationConfig,
+    'TIME': PolishAbbreviationConfig,
+    'WEEKDAY': PolishAbbreviationConfig,
+    'MONTH': PolishAbbreviationConfig,
+    'NUMBER_MONTH': PolishAbbreviationConfig,
+    'CURRENCY_SYMBOL': PolishAbbreviationConfig,
+    'MATH_SYMBOL': PolishAbbreviationConfig,
+    'SPECIAL_TRANSLITERATE': RegExConfig,
+    'CURRENCY_MAGNITUDE': RegExConfig,
+}
+
+
+def default_cache_dir():
+    return os.environ.get('POLISH_TRANSLITERATE_CACHE') or \
+        os.path.join(os.path.expanduser('~'), '.cache', 'polish_transliterate')
+
+
+def _defaults_fingerprint():
+    # derived tables also depend on the built-in tables, which change with the package
+    data = repr([(name, getattr(cls, name)) for name, cls in sorted(TABLES.items())])
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def config_digest(path):
+    """
+    Content hash of a config file, used as cache key and to detect changed files
+
+    :param path:
+    :return: str
+    """
+    h = hashlib.sha256()
+    h.update(('%d:%s:' % (FORMAT_VERSION, _defaults_fingerprint())).encode('utf-8'))
+    with open(path, 'rb') as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+
+def read_config_file(path):
+    """
+    Parses a JSON (or, by extension, TOML) config file
+
+    :param path:
+    :return: dict
+    """
+    if path.endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:
+            raise ImportError('reading TOML configs requires Python 3.11+ (tomllib), use JSON instead')
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _convert(name, value):
+    # JSON/TOML have no sets or tuples
+    if name == 'EXCLUDE':
+        return set(value)
+    if name == 'SPECIAL_TRANSLITERATE':
+        return {pat: tuple(repl) for pat, repl in value.items()}
+    if name == 'CURRENCY_MAGNITUDE':
+        return list(value)
+    return dict(value)
+
+
+def _merge(name, base, value):
+    if name == 'EXCLUDE':
+        return set(base) | value
+    if name == 'CURRENCY_MAGNITUDE':
+        return list(base) + value
+    merged = dict(base)
+    merged.update(value)
+    return merged
+
+
+class ConfigData:
+    """
+    Loaded config: table overrides per config class plus the tables derived from them
+    """
+
+    def __init__(self, digest, overrides, derived):
+        """
+        Constructor
+
+        :param digest: content hash, see `config_digest`
+        :param overrides: dict of config class name -> dict of table name -> table
+        :param derived: dict of precomputed tables ('accent_table', 'misc_index', 'weekday_index', 'month_index')
+        """
+        self.digest = digest
+        self.overrides = overrides
+        self.derived = derived
+
+    def configured(self, cls):
+        """
+        Returns `cls`, or a subclass of it with the overridden tables
+        """
+        overrides = self.overrides.get(cls.__name__)
+        if not overrides:
+            return cls
+        return type(cls.__name__, (cls,), dict(overrides))
+
+
+def build_config(path, digest=None):
+    """
+    Parses a config file and derives its tables (no caching)
+
+    :param path:
+    :param digest: content hash, computed if not given
+    :return: ConfigData
+    """
+    data = read_config_file(path)
+    extend = data.pop('extend', {}) or {}
+    unknown = (set(data) | set(extend)) - set(TABLES)
+    if unknown:
+        raise ValueError('unknown tables in config ' + path + ': ' + ', '.join(sorted(unknown)))
+
+    overrides = {}
+    for name, cls in TABLES.items():
+        table = getattr(cls, name)
+        if name in data:
+            table = _convert(name, data[name])
+        if name in extend:
+            table = _merge(name, table, _convert(name, extend[name]))
+        if name in data or name in extend:
+            overrides.setdefault(cls.__name__, {})[name] = table
+
+    def table(name):
+        return overrides.get(TABLES[name].__name__, {}).get(name, getattr(TABLES[name], name))
+
+    derived = {
+        'accent_table': _build_accent_table(table('UNICODE_TO_ASCII')),
+        'misc_index': _build_misc_index(table('MISC')),
+        'weekday_index': dict(table('WEEKDAY')),
+        'month_index': dict(table('MONTH')),
+    }
+    return ConfigData(digest or config_digest(path), overrides, derived)
+
+
+def _cache_path(digest, cache_dir):
+    return os.path.join(cache_dir or default_cache_dir(), digest + '.pickle')
+
+
+def load_config(path, digest=None, cache_dir=None, use_cache=True):
+    """
+    Loads a config file, from its binary cache if it is up to date, otherwise parses it and writes the cache
+
+    :param path:
+    :param digest: expected content hash; raises ValueError if the file does not match it anymore
+    :param cache_dir: defaults to $POLISH_TRANSLITERATE_CACHE or ~/.cache/polish_transliterate
+    :param use_cache: if False, neither read nor write the cache
+    :return: ConfigData
+    """
+    actual = config_digest(path)
+    if digest is not None and digest != actual:
+        raise ValueError('config file changed since the pipeline was compiled: ' + path)
+
+    if use_cache:
+        cache_path = _cache_path(actual, cache_dir)
+        try:
+            with open(cache_path, 'rb') as f:
+                config = pickle.load(f)
+            if isinstance(config, ConfigData) and config.digest == actual:
+                return config
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass
+
+    config = build_config(path, actual)
+    if use_cache:
+        _write_cache(config, cache_path)
+    return config
+
+
+def _write_cache(config, cache_path):
+    # atomic replace, concurrent workers may write the same cache file; an unwritable cache is not an error
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+
+
+def compile_config(path, cache_dir=None):
+    """
+    Builds (or refreshes) the binary cache of a config file ahead of time
+
+    :param path:
+    :param cache_dir:
+    :return: path of the cache file
+    """
+    config = build_config(path)
+    cache_path = _cache_path(config.digest, cache_dir)
+    _write_cache(config, cache_path)
+    return cache_path
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('usage: python -m polish_transliterate.config CONFIG_FILE [CACHE_DIR]', file=sys.stderr)
+        sys.exit(-1)
+    print(compile_config(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None))
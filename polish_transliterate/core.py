@@ -1,6 +1,25 @@
+import itertools
+import os
 import re
 import sys
-from num2words import num2words
+import threading
+from array import array
+from collections import OrderedDict, deque
+from functools import lru_cache, partial
+from types import MappingProxyType
+
+# imported on first use (see `num2words` below and `PolishTransliterate._make_pool`): num2words loads all of its
+# language modules, concurrent.futures.process pulls in multiprocessing; both dominate the import time otherwise
+_num2words = None
+
+
+def num2words(number, lang='pl', to='cardinal'):
+    global _num2words
+    if _num2words is None:
+        from num2words import num2words as convert
+        _num2words = convert
+    return _num2words(number, lang=lang, to=to)
+
 
 class PLConfig:
     pass
@@ -69,6 +88,7 @@ class PolishAcronymPhonemeConfig(PLConfig):
         'Ę': 'ę',
         'Ł': 'el',
         'Ń': 'ń',
+        'Ó': 'ó',
         'Ś': 'ś',
         'Ź': 'ź',
         'Ż': 'ż',
@@ -201,6 +221,37 @@ class RegExConfig(PLConfig):
     CONFIG for various regular expressions used for transliterations
     """
 
+    SPECIAL_TRANSLITERATE = {
+        '.*\+/\-.*': ('+/-', 'plus minus'),
+        '.*&.*': ('&', ' i '),
+        '(^|(?<=[\.!?;:\-\s]))([a-z]{0,1}|[\d]+)\s{0,1}[^-]\-\s{0,1}([\d]+|[a-z]{0,1})($|(?=[\.!?;:\-\s]+))': (
+            '-', ' do '),
+        '\\b[02-9]+\s{0,1}/\s{0,1}\d+\\b': ('/', ' z '),
+        '\\b1/10\\b': ('1/10', 'jedna dziesiąta'),
+        '\\b⅒\\b': ('⅒', 'jedna dziesiąta'),
+        '\\b1/9\\b': ('1/9', 'jedna dziewiąta'),
+        '\\b⅑\\b': ('⅑', 'jedna dziewiąta'),
+        '\\b1/8\\b': ('1/8', 'jedna ósma'),
+        '\\b⅛\\b': ('⅛', 'jedna ósma'),
+        '\\b1/7\\b': ('1/7', 'jedna siódma'),
+        '\\b⅐\\b': ('⅐', 'jedna siódma'),
+        '\\b1/6\\b': ('1/6', 'jedna szósta'),
+        '\\b⅙\\b': ('⅙', 'jedna szósta'),
+        '\\b1/5\\b': ('1/5', 'jedna piąta'),
+        '\\b⅕\\b': ('⅕', 'jedna piąta'),
+        '\\b1/4\\b': ('1/4', 'jedna czwarta'),
+        '\\b¼\\b': ('¼', 'jedna czwarta'),
+        '\\b1/3\\b': ('1/3', 'jedna trzecia'),
+        '\\b⅓\\b': ('⅓', 'jedna trzecia'),
+        '\\b1/2\\b': ('1/2', 'pół'),
+        '\\b½\\b': ('½', 'pół'),
+        '\\b1000\\b': ('1000', 'tysiąc'),
+    }
+
+    CURRENCY_MAGNITUDE = ['\\bmln\\b', '\\bmln\.\\b', '\\bmld\\b', '\\bmld\.\\b',
+                          '\\bmilion[y]{0,1}\\b', '\\bmiliard[y]{0,1}\\b',
+                          '\\btysiąc\\b']
+
     def __init__(self, generic_config, acronym_phoneme_config, unit_config, abbreviation_config):
         """
         Constructor
@@ -210,361 +261,1299 @@ class RegExConfig(PLConfig):
         :param unit_config:
         :param abbreviation_config:
         """
+        self.generic_config = generic_config
+        self.acronym_phoneme_config = acronym_phoneme_config
+        self.unit_config = unit_config
+        self.abbreviation_config = abbreviation_config
+
+    def __getattr__(self, name):
+        # patterns are compiled on first access (see `_PATTERNS`), so disabled ops never build theirs
+        build = self._PATTERNS.get(name)
+        if build is None:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
         try:
-            self.generic_config = generic_config
-            self.acronym_phoneme_config = acronym_phoneme_config
-            self.unit_config = unit_config
-            self.abbreviation_config = abbreviation_config
-
-            self.SPECIAL_TRANSLITERATE = {
-                '.*\+/\-.*': ('+/-', 'plus minus'),
-                '.*&.*': ('&', ' i '),
-                '(^|(?<=[\.!?;:\-\s]))([a-z]{0,1}|[\d]+)\s{0,1}[^-]\-\s{0,1}([\d]+|[a-z]{0,1})($|(?=[\.!?;:\-\s]+))': (
-                    '-', ' do '),
-                '\\b[02-9]+\s{0,1}/\s{0,1}\d+\\b': ('/', ' z '),
-                '\\b1/10\\b': ('1/10', 'jedna dziesiąta'),
-                '\\b⅒\\b': ('⅒', 'jedna dziesiąta'),
-                '\\b1/9\\b': ('1/9', 'jedna dziewiąta'),
-                '\\b⅑\\b': ('⅑', 'jedna dziewiąta'),
-                '\\b1/8\\b': ('1/8', 'jedna ósma'),
-                '\\b⅛\\b': ('⅛', 'jedna ósma'),
-                '\\b1/7\\b': ('1/7', 'jedna siódma'),
-                '\\b⅐\\b': ('⅐', 'jedna siódma'),
-                '\\b1/6\\b': ('1/6', 'jedna szósta'),
-                '\\b⅙\\b': ('⅙', 'jedna szósta'),
-                '\\b1/5\\b': ('1/5', 'jedna piąta'),
-                '\\b⅕\\b': ('⅕', 'jedna piąta'),
-                '\\b1/4\\b': ('1/4', 'jedna czwarta'),
-                '\\b¼\\b': ('¼', 'jedna czwarta'),
-                '\\b1/3\\b': ('1/3', 'jedna trzecia'),
-                '\\b⅓\\b': ('⅓', 'jedna trzecia'),
-                '\\b1/2\\b': ('1/2', 'pół'),
-                '\\b½\\b': ('½', 'pół'),
-                '\\b1000\\b': ('1000', 'tysiąc'),
-            }
-
-            self.CURRENCY_MAGNITUDE = ['\\bmln\\b', '\\bmln\.\\b', '\\bmld\\b', '\\bmld\.\\b',
-                                       '\\bmilion[y]{0,1}\\b', '\\bmiliard[y]{0,1}\\b',
-                                       '\\btysiąc\\b']
-
-            self.DETECT_ABBREVIATION = re.compile(
-                '(^|(?<=[\.!?;:\-\s,\(\[\{]))([A-ZĄĆĘŁŃÓŚŹŻ]{2,}|([A-ZĄĆĘŁŃÓŚŹŻ]\.){2,})($|(?=[\.!?;:\-\s,\)\]\}]+))')
-            self.DETECT_WEEKDAY = re.compile('\\b(' + '|'.join(self.abbreviation_config.WEEKDAY.keys()) + ')\\b')
-            self.DETECT_MONTH = re.compile('\\b(' + '|'.join(self.abbreviation_config.MONTH.keys()) + ')\\b')
-            self.DETECT_TIME_OF_DAY = re.compile(
-                '(\\b(([0-1][0-9]|2[0-3])[\.\:]|[0-9][\.\:])([0-5][0-9]|[0-9])\s{0,1}(h|godz|godziny){0,1}\\b)')
-            self.DETECT_TIMESTAMP = re.compile(
-                '(\\b\d+(h|godz){0,1}:([0-5][0-9]|[0-9])(m|min){0,1}(:([0-5][0-9]|[0-9])(s|sek){0,1}){0,1}\\b)')
-            self.DETECT_DATE = re.compile(
-                '(([1-9]|(0[1-9])|(1[0-9])|(2[0-9])|30|31)\.(((([1-9]|0[1-9])|(10|11|12))\.)|(\s{0,1}('
-                + '|'.join(self.abbreviation_config.MONTH.keys()) + ')(\.|\\b)))(\s{0,1}\d\d\d\d|\s{0,1}\d\d){0,1})')
-            self.DETECT_ORDINAL = re.compile('[\(\[]{0,1}\d+\.[\)\]]{0,1}')
-            self.DETECT_NUMBER = re.compile('([\+\-]{0,1}\d+[\d\.,]*)')
-            self.DETECT_WHITESPACE_SEQ = re.compile('\s+')
-
-            # static regex patterns but contents depending on input parameter config (thus set to None, initially)
-            self.DETECT_CURRENCY_SYMBOL = None
-            self.DETECT_CURRENCY_MAGNITUDE = None
-            self.DETECT_CURRENCY = None
-
+            value = build(self)
         except Exception as e:
             print('', file=sys.stderr)
             print('*** An exception occurred in section', sys._getframe().f_code.co_name,
-                  'of class', type(self).__name__, '- see Traceback for details',
+                  'of class', type(self).__name__, 'compiling', name, '- see Traceback for details',
                   file=sys.stderr)
             print('', file=sys.stderr)
             raise e
+        setattr(self, name, value)
+        return value
+
+    # static regex patterns but contents depending on the currency config
+    def _currency_symbol_string(self):
+        escaped_cursym = [re.escape(it) for it in self.abbreviation_config.CURRENCY_SYMBOL.keys()]
+        return '|'.join(escaped_cursym).replace('_', self.generic_config.SEP_MASK)
+
+    def _currency_magnitude_string(self):
+        return '|'.join(self.CURRENCY_MAGNITUDE)
+
+    def _currency_string(self):
+        rstring_cursym_escaped = self._currency_symbol_string()
+        rstring_curmagn = self._currency_magnitude_string()
+        return '(^|(?<=[\.!?;:\-\(\)\[\]\s]))(([\+\-]{0,1}\d+[\d\.,]*\s*(' \
+               + rstring_curmagn + '){0,1}\s*' + '(' \
+               + rstring_cursym_escaped + '))|' + '((' \
+               + rstring_cursym_escaped + ')\s*[\+\-]{0,1}\d+[\d\.,]*\s*(' \
+               + rstring_curmagn + '){0,1})|' + '(' \
+               + rstring_cursym_escaped \
+               + '))($|(?=[\.!?;:\-\(\)\[\]\s]+))'
+
+    # attribute -> builder, each called once per instance
+    _PATTERNS = {
+        # compiled once, in table order (entries apply one after another on the same word);
+        # an entry can only apply when the string it replaces occurs in the word, so a word without
+        # any of their first characters skips the whole op and a combined alternation gates the rest
+        'SPECIAL_TRANSLITERATE_COMPILED': lambda self: tuple(
+            (re.compile(pat), old, new) for pat, (old, new) in self.SPECIAL_TRANSLITERATE.items()),
+        'SPECIAL_PREFILTER': lambda self: re.compile(
+            '[' + ''.join(sorted({re.escape(old[0]) for old, _ in self.SPECIAL_TRANSLITERATE.values()})) + ']'),
+        'DETECT_SPECIAL': lambda self: re.compile(
+            '|'.join('(?:' + pat + ')' for pat in self.SPECIAL_TRANSLITERATE)),
+        # DETECT_ABBREVIATION needs two capitals in a row or separated by a dot
+        'ABBREVIATION_PREFILTER': lambda self: re.compile('[A-ZĄĆĘŁŃÓŚŹŻ]\\.?[A-ZĄĆĘŁŃÓŚŹŻ]'),
+        'DETECT_ABBREVIATION': lambda self: re.compile(
+            '(^|(?<=[\.!?;:\-\s,\(\[\{]))([A-ZĄĆĘŁŃÓŚŹŻ]{2,}|([A-ZĄĆĘŁŃÓŚŹŻ]\.){2,})'
+            '($|(?=[\.!?;:\-\s,\)\]\}]+))'),
+        'DETECT_WEEKDAY': lambda self: re.compile(
+            '\\b(' + '|'.join(self.abbreviation_config.WEEKDAY.keys()) + ')\\b'),
+        'DETECT_MONTH': lambda self: re.compile('\\b(' + '|'.join(self.abbreviation_config.MONTH.keys()) + ')\\b'),
+        'DETECT_TIME_OF_DAY': lambda self: re.compile(
+            '(\\b(([0-1][0-9]|2[0-3])[\.\:]|[0-9][\.\:])([0-5][0-9]|[0-9])\s{0,1}(h|godz|godziny){0,1}\\b)'),
+        'DETECT_TIMESTAMP': lambda self: re.compile(
+            '(\\b\d+(h|godz){0,1}:([0-5][0-9]|[0-9])(m|min){0,1}(:([0-5][0-9]|[0-9])(s|sek){0,1}){0,1}\\b)'),
+        'DETECT_DATE': lambda self: re.compile(
+            '(([1-9]|(0[1-9])|(1[0-9])|(2[0-9])|30|31)\.(((([1-9]|0[1-9])|(10|11|12))\.)|(\s{0,1}('
+            + '|'.join(self.abbreviation_config.MONTH.keys()) + ')(\.|\\b)))(\s{0,1}\d\d\d\d|\s{0,1}\d\d){0,1})'),
+        'DETECT_ORDINAL': lambda self: re.compile('[\(\[]{0,1}\d+\.[\)\]]{0,1}'),
+        'DETECT_NUMBER': lambda self: re.compile('([\+\-]{0,1}\d+[\d\.,]*)'),
+        'DETECT_WHITESPACE_SEQ': lambda self: re.compile('\s+'),
+        'DETECT_CURRENCY_SYMBOL': lambda self: re.compile(self._currency_symbol_string()),
+        'DETECT_CURRENCY_MAGNITUDE': lambda self: re.compile(self._currency_magnitude_string()),
+        'DETECT_CURRENCY': lambda self: re.compile(self._currency_string()),
+    }
+
+
+class NumberWords:
+    """
+    Memoizing layer in front of `num2words` (lang='pl') for cardinal, ordinal and year conversion
+
+    Every conversion goes through a bounded LRU cache. Optionally, tables for the most frequent values
+    (cardinals 0-9999, ordinals 1-31, years 1900-2099) are built lazily on first use and consulted first.
+    Instances are thread-safe; `NUMBER_WORDS` is the process-wide default used by `PolishTransliterate`.
+    """
+
+    TABLE_RANGES = {
+        'cardinal': range(0, 10000),
+        'ordinal': range(1, 32),
+        'year': range(1900, 2100),
+    }
+
+    def __init__(self, maxsize=4096, precompute=False):
+        """
+        Constructor
+
+        :param maxsize: max. number of cached conversions per kind (None for unbounded, 0 disables caching)
+        :param precompute: if True, build and use the precomputed tables (lazily, on first use)
+        """
+        self.maxsize = maxsize
+        self.precompute = precompute
+        self._tables = {}
+        self._tables_lock = threading.Lock()
+        self._table_hits = {to: 0 for to in self.TABLE_RANGES}
+        self._cached = {to: lru_cache(maxsize=maxsize, typed=True)(self._converter(to))
+                        for to in self.TABLE_RANGES}
+
+    @staticmethod
+    def _converter(to):
+        def convert(number):
+            return num2words(number, lang='pl', to=to)
+        return convert
+
+    def _table(self, to):
+        table = self._tables.get(to)
+        if table is None:
+            with self._tables_lock:
+                table = self._tables.get(to)
+                if table is None:
+                    table = {i: num2words(i, lang='pl', to=to) for i in self.TABLE_RANGES[to]}
+                    self._tables[to] = table
+        return table
+
+    def convert(self, number, to='cardinal'):
+        """
+        Converts a number (int, float or numeric string) to Polish words
+
+        :param number:
+        :param to: 'cardinal', 'ordinal' or 'year'
+        :return: str
+        """
+        if self.precompute:
+            if type(number) is int:
+                key = number
+            elif type(number) is str and number.isascii() and number.isdigit():
+                key = int(number)
+            else:
+                key = None
+            if key is not None:
+                word = self._table(to).get(key)
+                if word is not None:
+                    self._table_hits[to] += 1
+                    return word
+        return self._cached[to](number)
+
+    def cardinal(self, number):
+        return self.convert(number, 'cardinal')
+
+    def ordinal(self, number):
+        return self.convert(number, 'ordinal')
+
+    def year(self, number):
+        return self.convert(number, 'year')
+
+    def stats(self):
+        """
+        Returns hit/miss statistics per conversion kind
+
+        :return: dict of kind -> dict(hits, misses, table_hits, size, maxsize)
+        """
+        stats = {}
+        for to, cached in self._cached.items():
+            info = cached.cache_info()
+            stats[to] = {'hits': info.hits, 'misses': info.misses, 'table_hits': self._table_hits[to],
+                         'size': info.currsize, 'maxsize': info.maxsize}
+        return stats
+
+    def __reduce__(self):
+        # caches are process-local, a copy starts empty
+        return type(self), (self.maxsize, self.precompute)
+
+    def clear(self):
+        for cached in self._cached.values():
+            cached.cache_clear()
+        for to in self._table_hits:
+            self._table_hits[to] = 0
+
+
+NUMBER_WORDS = NumberWords()
+
+
+class CompiledPipeline:
+    """
+    Immutable bundle of configs and compiled regular expressions for one combination of
+    transliterate parameters. Instances are built once per process (see `compile_pipeline`),
+    can be shared between threads and pickle to their parameters only, so a worker process
+    receiving one picks up (or builds) its own cached copy. The lookup tables are read-only mappings,
+    since all instances with the same parameters share them.
+    """
+
+    __slots__ = ('transliterate_ops', 'replace', 'sep_abbreviation', 'make_lowercase', 'config',
+                 'generic_config', 'acronym_phoneme_config', 'unit_config', 'abbreviation_config', 'regex',
+                 'accent_table', 'replace_prefilter', 'misc_index', 'weekday_index', 'month_index',
+                 'mask_acronym', 'spell_acronym', 'op_gates', 'profile_pattern', 'engine', 'merged_detector',
+                 'alpha_word_ops')
+
+    def __init__(self, transliterate_ops, replace, sep_abbreviation, make_lowercase, config=None,
+                 engine='sequential'):
+        """
+        Constructor, use `compile_pipeline` instead of calling it directly
+
+        :param transliterate_ops: tuple of op names, in order
+        :param replace: tuple of (old, new) replacement pairs, in order
+        :param sep_abbreviation:
+        :param make_lowercase:
+        :param config: None for the built-in tables, otherwise (path, digest) of a config file
+                       (see `polish_transliterate.config`)
+        :param engine: 'sequential' or 'merged', see `PolishTransliterate`
+        """
+        if engine not in ENGINES:
+            raise ValueError('unknown engine: ' + repr(engine))
+        derived = {}
+        config_classes = (PolishReplacementConfig, PolishAcronymPhonemeConfig, PolishUnitConfig,
+                          PolishAbbreviationConfig, RegExConfig)
+        if config is not None:
+            from polish_transliterate.config import load_config
+            config_data = load_config(config[0], digest=config[1])
+            derived = config_data.derived
+            config_classes = tuple(config_data.configured(cls) for cls in config_classes)
+        generic_cls, acronym_phoneme_cls, unit_cls, abbreviation_cls, regex_cls = config_classes
+
+        generic_config = generic_cls()
+        acronym_phoneme_config = acronym_phoneme_cls()
+        unit_config = unit_cls()
+        abbreviation_config = abbreviation_cls()
+
+        _set = super().__setattr__
+        _set('transliterate_ops', transliterate_ops)
+        _set('replace', replace)
+        _set('sep_abbreviation', sep_abbreviation)
+        _set('make_lowercase', make_lowercase)
+        _set('config', config)
+        _set('generic_config', generic_config)
+        _set('acronym_phoneme_config', acronym_phoneme_config)
+        _set('unit_config', unit_config)
+        _set('abbreviation_config', abbreviation_config)
+        _set('regex', regex_cls(generic_config, acronym_phoneme_config, unit_config, abbreviation_config))
+        _set('accent_table', MappingProxyType(derived.get('accent_table')
+                                              or _build_accent_table(generic_config.UNICODE_TO_ASCII)))
+        _set('replace_prefilter', _build_replace_prefilter(replace))
+        _set('misc_index', MappingProxyType(derived.get('misc_index') or _build_misc_index(abbreviation_config.MISC)))
+        _set('weekday_index', MappingProxyType(derived.get('weekday_index') or dict(abbreviation_config.WEEKDAY)))
+        _set('month_index', MappingProxyType(derived.get('month_index') or dict(abbreviation_config.MONTH)))
+        # memos for acronym expansion, the same acronyms recur a lot
+        _set('mask_acronym', lru_cache(maxsize=4096)(partial(_mask_acronym, generic_config.SEP_MASK)))
+        _set('spell_acronym', lru_cache(maxsize=4096)(
+            partial(_spell_acronym, generic_config.SEP_MASK, acronym_phoneme_config.LETTER)))
+        _set('op_gates', MappingProxyType(_build_op_gates(generic_config, acronym_phoneme_config, abbreviation_config,
+                                                          self.regex, self.weekday_index, self.month_index)))
+        _set('profile_pattern', _build_profile_pattern(self.op_gates))
+        _set('alpha_word_ops', _build_alpha_word_ops(abbreviation_config, self.regex))
+        _set('engine', engine)
+        _set('merged_detector', _build_merged_detector(transliterate_ops, self.regex, generic_config,
+                                                       abbreviation_config) if engine == 'merged' else None)
+
+    @property
+    def key(self):
+        return (self.transliterate_ops, self.replace, self.sep_abbreviation, self.make_lowercase, self.config,
+                self.engine)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(type(self).__name__ + ' is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(type(self).__name__ + ' is immutable')
+
+    def __reduce__(self):
+        return _pipeline_from_key, (self.key,)
+
+    def __repr__(self):
+        return type(self).__name__ + repr(self.key)
+
+
+def _build_accent_table(unicode_to_ascii):
+    # str.translate() mapping, the first entry wins for characters listed more than once
+    table = {}
+    for chars, mapped in unicode_to_ascii.items():
+        for c in chars:
+            table.setdefault(ord(c), mapped)
+    return table
+
+
+def _build_replace_prefilter(replace):
+    # for a handful of replacements plain str.replace() calls are cheapest (str.translate() is slower on
+    # word-sized strings), larger sets are gated by one search so words without any key skip them all
+    if len(replace) <= 4:
+        return None
+    return re.compile('|'.join(re.escape(old) for old, _ in replace if old))
+
+
+def _build_misc_index(misc):
+    # a word is replaced if it equals an abbreviation with or without a trailing dot, first entry wins
+    index = {}
+    for short, long in misc.items():
+        for key in (short, short + '.'):
+            if long not in key:
+                index.setdefault(key, long)
+    return index
+
+
+def _has_letter(keys):
+    # whether a purely alphabetic word may contain one of the keys
+    return any(not key or any(c.isalpha() for c in key) for key in keys)
+
+
+def _build_alpha_word_ops(abbreviation_config, regex):
+    # word ops which can change purely alphabetic tokens: ordinals need digits, special and math symbols only
+    # match such tokens with a key containing a letter (the built-in tables have none, custom ones may)
+    ops = {'weekday', 'month', 'spoken_symbol'}
+    if _has_letter(old for old, _ in regex.SPECIAL_TRANSLITERATE.values()):
+        ops.add('special')
+    if _has_letter(abbreviation_config.MATH_SYMBOL):
+        ops.add('math_symbol')
+    return frozenset(ops)
+
+
+# num2words (lang='pl') spells numbers with these characters only
+_NUMBER_WORD_CHARS = ' abcdefghijklmnoprstuwyzóąćęłńśźż'
+# words the timestamp and time of day ops write besides numbers
+_TIME_WORDS = 'jedna godzina minuta sekunda godzin minut sekund'
+
+
+def _first_chars(keys):
+    # an entry can only apply to a text containing the first character of its key
+    keys = list(keys)
+    return frozenset(key[0] for key in keys) if all(keys) else None
+
+
+def _build_op_gates(generic_config, acronym_phoneme_config, abbreviation_config, regex, weekday_index, month_index):
+    # op -> (characters one of which a text must contain for the op to change it, None if no character rules it
+    # out; characters the op may write which another op needs, so it may apply to the output)
+    sep_mask = generic_config.SEP_MASK
+    digits = frozenset('0123456789')
+    spoken_symbol = getattr(abbreviation_config, 'SPOKEN_SYMBOL', None)
+    gates = {
+        'amount_money': (_first_chars(key.replace('_', sep_mask) for key in abbreviation_config.CURRENCY_SYMBOL),
+                         sep_mask + ''.join(acronym_phoneme_config.LETTER.values())
+                         + ''.join(abbreviation_config.CURRENCY_SYMBOL.values())),
+        'date': (digits, _NUMBER_WORD_CHARS + ''.join(abbreviation_config.MONTH.values())
+                 + ''.join(abbreviation_config.NUMBER_MONTH.values())),
+        'timestamp': (digits, _TIME_WORDS),
+        'time_of_day': (digits, _TIME_WORDS),
+        'weekday': (None, ''.join(weekday_index.values())),
+        'month': (None, ''.join(month_index.values())),
+        'ordinal': (digits, _NUMBER_WORD_CHARS),
+        'special': (_first_chars(old for old, _ in regex.SPECIAL_TRANSLITERATE.values()),
+                    _NUMBER_WORD_CHARS + ''.join(new for _, new in regex.SPECIAL_TRANSLITERATE.values())),
+        'math_symbol': (_first_chars(abbreviation_config.MATH_SYMBOL),
+                        ''.join(abbreviation_config.MATH_SYMBOL.values())),
+        # a missing table fails in the op itself
+        'spoken_symbol': (None, '') if spoken_symbol is None else (
+            _first_chars(pats[0] for pats in spoken_symbol),
+            sep_mask + ''.join(repl.replace('_', sep_mask) for repl in spoken_symbol.values())),
+    }
+    needed = frozenset().union(*(chars for chars, _ in gates.values() if chars is not None))
+    return {op: (chars, needed.intersection(written)) for op, (chars, written) in gates.items()}
+
+
+def _build_profile_pattern(op_gates):
+    # one character class of everything an op needs; digits are matched like `\d` does
+    needed = frozenset().union(*(chars for chars, _ in op_gates.values() if chars is not None))
+    return re.compile('[\\d' + ''.join(re.escape(c) for c in sorted(needed)) + ']')
+
+
+# engines running the text-level ops: one after another, or all in one pass (see `MergedDetector`)
+ENGINES = ('sequential', 'merged')
+
+# text-level ops in pipeline order, which is their priority in the merged engine: (op, pattern of `RegExConfig`)
+TEXT_OP_PATTERNS = (
+    ('amount_money', 'DETECT_CURRENCY'),
+    ('date', 'DETECT_DATE'),
+    ('timestamp', 'DETECT_TIMESTAMP'),
+    ('time_of_day', 'DETECT_TIME_OF_DAY'),
+)
+
+
+def _build_merged_detector(transliterate_ops, regex, generic_config, abbreviation_config):
+    detectors = [(op, getattr(regex, name)) for op, name in TEXT_OP_PATTERNS if op in transliterate_ops]
+    if not detectors:
+        return None
+    # dates and times start with a digit, amounts also with a sign or a currency symbol
+    start_chars = {'\\d'}
+    if 'amount_money' in transliterate_ops:
+        start_chars.update(('\\+', '\\-'))
+        start_chars.update(re.escape(key.replace('_', generic_config.SEP_MASK)[:1])
+                           for key in abbreviation_config.CURRENCY_SYMBOL)
+    # an amount keeps its number, which the date and time ops go on to rewrite
+    return MergedDetector(detectors, ''.join(sorted(start_chars)), rescanned=('amount_money',))
+
+
+class MergedDetector:
+    """
+    The detectors of several text-level ops as one pattern, finding the matches of all of them in a single pass
+
+    The detectors are alternatives in priority order (the order the sequential engine runs them in), each a group
+    named after its op. Where one pass cannot reproduce the sequential engine, which scans the text again after
+    each op, `scan` gives up: if a detector of higher priority matches inside a match, if matches of different
+    ops are too close for their context (lookarounds, `\\b`) to be the same, or if the output of an op has to be
+    scanned again.
+    """
+
+    def __init__(self, detectors, start_chars, rescanned=()):
+        """
+        Constructor
+
+        :param detectors: list of (op name, compiled pattern), highest priority first
+        :param start_chars: regex character class contents of the characters any match starts with
+        :param rescanned: ops whose output the detectors of lower priority have to see
+        """
+        self.ops = tuple(op for op, _ in detectors)
+        self.pattern = re.compile('|'.join('(?P<%s>%s)' % (op, pattern.pattern) for op, pattern in detectors))
+        # sre cannot skip ahead on the alternatives, scanning for their start characters can
+        self._start = re.compile('[' + start_chars + ']')
+        self._higher = {op: re.compile('|'.join(pattern.pattern for _, pattern in detectors[:i])) if i else None
+                        for i, (op, _) in enumerate(detectors)}
+        self._rescanned = frozenset(op for op in rescanned if op in self.ops[:-1])
+
+    def scan(self, text):
+        """
+        Finds the matches to rewrite
+
+        :param text:
+        :return: list of matches, left to right and non-overlapping (`lastgroup` is the op), or None if the
+                 sequential engine has to run instead
+        """
+        find_start = self._start.search
+        match = self.pattern.match
+        higher = self._higher
+        rescanned = self._rescanned
+        matches = []
+        last_op = None
+        last_end = -2
+        pos = 0
+        while True:
+            m = find_start(text, pos)
+            if m is None:
+                return matches
+            start = m.start()
+            m = match(text, start)
+            if m is None:
+                pos = start + 1
+                continue
+            op = m.lastgroup
+            end = m.end()
+            if op in rescanned:
+                return None
+            # ops see at most two characters around their matches
+            if op != last_op and start - last_end < 2:
+                return None
+            pattern = higher[op]
+            if pattern is not None and any(pattern.match(text, i) for i in range(start + 1, end)):
+                return None
+            matches.append(m)
+            last_op, last_end = op, end
+            pos = end
+
+
+_LEADING_PUNCT = '([{"\'„«'
+_TRAILING_PUNCT = ',;:!?)]}"\'”»'
+
+
+def lookup_word(index, word):
+    """
+    Looks up a word in a dict of replacements, ignoring surrounding punctuation (which is kept) and, if
+    needed, a sentence-final dot
+
+    :param index: dict of word -> replacement
+    :param word:
+    :return: the replaced word or None if there is no entry for it
+    """
+    hit = index.get(word)
+    if hit is not None:
+        return hit
+    stripped = word.lstrip(_LEADING_PUNCT)
+    core = stripped.rstrip(_TRAILING_PUNCT)
+    lead = word[:len(word) - len(stripped)]
+    tail = stripped[len(core):]
+    if lead or tail:
+        hit = index.get(core)
+        if hit is not None:
+            return lead + hit + tail
+    if core.endswith('.'):
+        hit = index.get(core[:-1])
+        if hit is not None:
+            return lead + hit + '.' + tail
+    return None
+
+
+def _mask_acronym(sep, acronym):
+    return sep.join(acronym.replace('.', ''))
+
+
+def _spell_acronym(sep, letters, acronym):
+    return sep.join([letters.get(c, c) for c in acronym.replace('.', '')])
+
+
+# max. number of pipelines kept by `compile_pipeline`, least recently used ones are dropped first (instances
+# holding a dropped pipeline keep using it)
+PIPELINE_CACHE_SIZE = 64
+
+_PIPELINE_CACHE = OrderedDict()
+_PIPELINE_LOCK = threading.Lock()
+
+
+# canonical op order, taken for op sets: their iteration order depends on the hash seed, so the pipeline key (and
+# the cache namespace derived from it) would differ between processes
+OP_ORDER = ('acronym_phoneme', 'accent_peculiarity', 'amount_money', 'date', 'timestamp', 'weekday', 'month',
+            'time_of_day', 'ordinal', 'special', 'math_symbol', 'spoken_symbol')
+
+
+def _pipeline_key(transliterate_ops, replace, sep_abbreviation, make_lowercase, config=None, engine='sequential'):
+    if isinstance(transliterate_ops, (set, frozenset)):
+        rank = {op: i for i, op in enumerate(OP_ORDER)}
+        ops = tuple(sorted(transliterate_ops, key=lambda op: (rank.get(op, len(rank)), op)))
+    else:
+        # keep the given op order (the per-word ops run in that order), drop duplicates
+        ops = tuple(dict.fromkeys(transliterate_ops))
+    repl = tuple(replace.items()) if isinstance(replace, dict) else tuple(replace)
+    if config is not None:
+        from polish_transliterate.config import config_digest
+        config = os.path.abspath(config)
+        config = config, config_digest(config)
+    return ops, repl, sep_abbreviation, bool(make_lowercase), config, engine
+
+
+def _pipeline_from_key(key):
+    with _PIPELINE_LOCK:
+        pipeline = _PIPELINE_CACHE.get(key)
+        if pipeline is None:
+            pipeline = _PIPELINE_CACHE[key] = CompiledPipeline(*key)
+            while len(_PIPELINE_CACHE) > PIPELINE_CACHE_SIZE:
+                _PIPELINE_CACHE.popitem(last=False)
+        else:
+            _PIPELINE_CACHE.move_to_end(key)
+    return pipeline
+
+
+def clear_pipeline_cache():
+    """
+    Drops all pipelines kept by `compile_pipeline`, e.g. after building many one-off configs
+    """
+    with _PIPELINE_LOCK:
+        _PIPELINE_CACHE.clear()
+
+
+def compile_pipeline(transliterate_ops=('acronym_phoneme', 'accent_peculiarity', 'amount_money', 'date',
+                                        'timestamp', 'time_of_day', 'ordinal', 'special'),
+                     replace={'-': ' '},
+                     sep_abbreviation=' ',
+                     make_lowercase=True,
+                     config=None,
+                     engine='sequential'):
+    """
+    Returns the process-wide `CompiledPipeline` for the given parameters, building it on first use
+
+    :param transliterate_ops: iterable of op names (see `PolishTransliterate`)
+    :param replace: dict (or iterable of pairs) of plain string replacements
+    :param sep_abbreviation:
+    :param make_lowercase:
+    :param config: path of a JSON/TOML file with custom tables (see `polish_transliterate.config`)
+    :param engine: 'sequential' or 'merged' (see `PolishTransliterate`)
+    :return: CompiledPipeline
+    """
+    return _pipeline_from_key(_pipeline_key(transliterate_ops, replace, sep_abbreviation, make_lowercase, config,
+                                            engine))
+
+
+# spans rewritten per thread, counted only once a profiler is attached (see `enable_span_counting`)
+_span_counter = None
+
+
+class _SpanCounter(threading.local):
+    count = 0
+    depth = 0
+
+
+def enable_span_counting():
+    """
+    Makes `rewrite_spans` count the spans it rewrites, per thread (see `counted_spans`); `profiling.Profiler`
+    reports them as the matches of each op
+    """
+    global _span_counter
+    if _span_counter is None:
+        _span_counter = _SpanCounter()
+
+
+def counted_spans():
+    """
+    Returns the number of spans rewritten in the current thread since `enable_span_counting`; spans rewritten
+    while a span is expanded (e.g. the currency acronym of an amount) are part of that span and not counted
+
+    :return: int
+    """
+    return _span_counter.count if _span_counter is not None else 0
+
+
+def rewrite_spans(text, spans, alignment=None):
+    """
+    Rewrites `text` in one pass from (start, end, replacement) spans
+
+    :param text: original text, all offsets refer to it
+    :param spans: iterable of (start, end, replacement) tuples, sorted and non-overlapping
+    :param alignment: optional `alignment.AlignmentBuilder` recording the spans
+    :return: str
+    """
+    counter = _span_counter
+    if counter is not None:
+        # the expansions run while the spans are collected, their own rewrites are nested
+        counter.depth += 1
+        try:
+            spans = list(spans)
+        finally:
+            counter.depth -= 1
+        if not counter.depth:
+            counter.count += len(spans)
+    if alignment is not None:
+        spans = list(spans)
+        alignment.add_spans(len(text), spans)
+    parts = []
+    last = 0
+    for start, end, replacement in spans:
+        parts.append(text[last:start])
+        parts.append(replacement)
+        last = end
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+def rewrite_matches(pattern, text, expand, alignment=None):
+    """
+    Replaces every match of a compiled `pattern` in `text` by `expand(match)` in one pass
+
+    :param pattern: compiled regular expression
+    :param text:
+    :param expand: callable taking a match and returning its replacement
+    :param alignment: optional `alignment.AlignmentBuilder` recording the replaced spans
+    :return: str
+    """
+    return rewrite_spans(text, ((m.start(), m.end(), expand(m)) for m in pattern.finditer(text)), alignment)
+
+
+TOKEN_ALPHA = 1
+
+
+class Tokens:
+    """
+    Tokens of a text split at single spaces, with their offsets into the text and type flags (`TOKEN_ALPHA`)
+
+    Ops rewrite `words` in place (including neighbouring tokens), `join` builds the resulting text once.
+    """
+
+    __slots__ = ('text', 'words', 'starts', 'ends', 'flags')
+
+    def __init__(self, text):
+        self.text = text
+        self.words = []
+        self.starts = array('l')
+        self.ends = array('l')
+        self.flags = bytearray()
+        pos = 0
+        for word in text.split(' '):
+            if word:
+                self.words.append(word)
+                self.starts.append(pos)
+                self.ends.append(pos + len(word))
+                self.flags.append(TOKEN_ALPHA if word.isalpha() else 0)
+            pos += len(word) + 1
+
+    def __len__(self):
+        return len(self.words)
+
+    def join(self):
+        return ' '.join(self.words)
+
+
+class TextProfile:
+    """
+    The characters of a text which some op needs (see `CompiledPipeline.op_gates`), from one scan over the text,
+    to skip ops which provably cannot change it
+
+    Every Unicode decimal digit counts as '0', so the ASCII digits gate the ops matching `\\d`.
+    """
+
+    __slots__ = ('chars',)
+
+    def __init__(self, text, pattern):
+        """
+        Constructor
+
+        :param text:
+        :param pattern: compiled character class of the characters to record (`CompiledPipeline.profile_pattern`)
+        """
+        chars = set(pattern.findall(text))
+        if not text.isascii() and any(not c.isascii() and c.isdecimal() for c in chars):
+            chars.add('0')
+        self.chars = chars
+
+    def admits(self, chars):
+        """
+        Whether an op may change the text
+
+        :param chars: characters one of which the op needs, None for any text
+        :return: bool
+        """
+        return chars is None or not chars.isdisjoint(self.chars)
+
+
+def _gil_enabled():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled() if is_gil_enabled else True
+
+
+_WORKER_TRANSLITERATOR = None
+
+
+def _init_worker(cls, pipeline, options):
+    # runs once per pool worker process: the pipeline unpickles to the worker's cached copy
+    global _WORKER_TRANSLITERATOR
+    _WORKER_TRANSLITERATOR = cls(pipeline=pipeline, **options)
+
+
+def _transliterate_chunk(texts):
+    return _WORKER_TRANSLITERATOR._transliterate_list(texts)
+
+
+def _rebuild(cls, pipeline, options):
+    # unpickles a transliterator, see `PolishTransliterate.__reduce__`
+    return cls(pipeline=pipeline, **options)
+
 
 class PolishTransliterate:
+    # word-level ops: op name -> (method name, whether the method takes the word's context); which of them can act on
+    # purely alphabetic tokens depends on the tables, see `CompiledPipeline.alpha_word_ops`
+    WORD_OPS = {
+        'weekday': ('_weekday_op', False),
+        'month': ('_month_op', False),
+        'ordinal': ('_ordinal_op', True),
+        'special': ('_special_op', False),
+        'math_symbol': ('_math_symbol_op', False),
+        'spoken_symbol': ('_spoken_symbol_op', True),
+    }
+
+    # text-level ops, in pipeline order: (op name, method, method expanding a match of its detector)
+    TEXT_OPS = (
+        ('amount_money', '_amount_money_op', '_expand_amount_money'),
+        ('date', '_date_op', '_expand_date'),
+        ('timestamp', '_timestamp_op', '_expand_timestamp'),
+        ('time_of_day', '_timeofday_op', '_expand_timeofday'),
+    )
+
     def __init__(self,
                  transliterate_ops=['acronym_phoneme', 'accent_peculiarity', 'amount_money', 'date', 'timestamp',
                                     'time_of_day', 'ordinal', 'special'],
                  replace={'-': ' '},
                  sep_abbreviation=' ',
-                 make_lowercase=True
+                 make_lowercase=True,
+                 pipeline=None,
+                 number_words=None,
+                 lexicon=None,
+                 config=None,
+                 cache=None,
+                 profiler=None,
+                 engine='sequential'
                  ):
-        self.transliterate_ops = transliterate_ops
-        self.replace = replace
-        self.sep_abbreviation = sep_abbreviation
-        self.make_lowercase = make_lowercase
-
-        self.generic_config = PolishReplacementConfig()
-        self.acronym_phoneme_config = PolishAcronymPhonemeConfig()
-        self.unit_config = PolishUnitConfig()
-        self.abbreviation_config = PolishAbbreviationConfig()
-        self.regex = RegExConfig(self.generic_config,
-                                 self.acronym_phoneme_config,
-                                 self.unit_config,
-                                 self.abbreviation_config)
+        if pipeline is None:
+            pipeline = compile_pipeline(transliterate_ops, replace, sep_abbreviation, make_lowercase, config, engine)
+        self.pipeline = pipeline
+
+        self.generic_config = pipeline.generic_config
+        self.acronym_phoneme_config = pipeline.acronym_phoneme_config
+        self.unit_config = pipeline.unit_config
+        self.abbreviation_config = pipeline.abbreviation_config
+        self.regex = pipeline.regex
+        self.number_words = number_words if number_words is not None else NUMBER_WORDS
+        self.lexicon = lexicon
+        self.cache = cache
+        # (lexicon version, namespace), recomputed when the lexicon changes
+        self._cache_namespace = None
+        # instrumented ops are instance attributes shadowing the methods, uninstrumented instances pay nothing
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.instrument(self)
+
+        # resolved once, so the per-word loop does not dispatch on op names
+        self._word_ops = tuple((getattr(self, self.WORD_OPS[op][0]), self.WORD_OPS[op][1],
+                                op not in pipeline.alpha_word_ops)
+                               for op in self.transliterate_ops if op in self.WORD_OPS)
+        self._word_op_gates = tuple((op, entry) + pipeline.op_gates[op] for op, entry in
+                                    zip((op for op in self.transliterate_ops if op in self.WORD_OPS), self._word_ops))
+        self._expanders = {op: getattr(self, expand) for op, _, expand in self.TEXT_OPS}
+
+        self._skip_lock = threading.Lock()
+        self.clear_skip_stats()
+
+    def __reduce__(self):
+        # rebuilt from the pipeline (which pickles to its key) and the options, locks and skip counters start fresh
+        return _rebuild, (type(self), self.pipeline, {'number_words': self.number_words, 'lexicon': self.lexicon,
+                                                      'cache': self.cache, 'profiler': self.profiler})
+
+    # the parameters are compiled into the pipeline, changing them takes a new instance
+
+    @property
+    def transliterate_ops(self):
+        return self.pipeline.transliterate_ops
+
+    @property
+    def replace(self):
+        return MappingProxyType(dict(self.pipeline.replace))
+
+    @property
+    def sep_abbreviation(self):
+        return self.pipeline.sep_abbreviation
+
+    @property
+    def make_lowercase(self):
+        return self.pipeline.make_lowercase
+
+    @property
+    def accent_table(self):
+        return self.pipeline.accent_table
+
+    def skip_stats(self):
+        """
+        Returns how often ops were skipped because the characters of a text ruled out any change (see `TextProfile`),
+        counted in this process
 
-        escaped_cursym = [re.escape(it) for it in self.abbreviation_config.CURRENCY_SYMBOL.keys()]
-        rstring_cursym_escaped = '|'.join(escaped_cursym).replace('_', self.generic_config.SEP_MASK)
-        rstring_curmagn = '|'.join(self.regex.CURRENCY_MAGNITUDE)
-        self.regex.DETECT_CURRENCY_SYMBOL = re.compile(rstring_cursym_escaped)
-        self.regex.DETECT_CURRENCY_MAGNITUDE = re.compile(rstring_curmagn)
+        :return: dict(texts=number of texts transliterated, skipped=dict of op -> number of texts it was skipped for)
+        """
+        with self._skip_lock:
+            self._retire_skip_counts()
+            texts, skipped = self._skip_retired[0], dict(self._skip_retired[1])
+            for _, counts in self._skip_live:
+                texts += counts[0]
+                # copied in one step, its thread may be adding ops
+                for op, n in counts[1].copy().items():
+                    skipped[op] = skipped.get(op, 0) + n
+        return {'texts': texts, 'skipped': skipped}
+
+    def clear_skip_stats(self):
+        with self._skip_lock:
+            # every thread counts into its own [texts, skipped] without locking; `skip_stats` sums them up, the
+            # counts of ended threads are folded into `_skip_retired`
+            self._skip_local = threading.local()
+            self._skip_live = []
+            self._skip_retired = [0, {}]
+
+    def _count_skipped(self, ops):
+        try:
+            counts = self._skip_local.counts
+        except AttributeError:
+            counts = self._thread_skip_counts()
+        counts[0] += 1
+        skipped = counts[1]
+        for op in ops:
+            skipped[op] = skipped.get(op, 0) + 1
+
+    def _thread_skip_counts(self):
+        counts = [0, {}]
+        with self._skip_lock:
+            # threads come and go, the counts of ended ones are folded whenever a new one starts counting
+            self._retire_skip_counts()
+            self._skip_local.counts = counts
+            self._skip_live.append((threading.current_thread(), counts))
+        return counts
+
+    def _retire_skip_counts(self):
+        # under `_skip_lock`: an ended thread no longer writes its counts
+        live = []
+        texts, skipped = self._skip_retired
+        for thread, counts in self._skip_live:
+            if thread.is_alive():
+                live.append((thread, counts))
+            else:
+                texts += counts[0]
+                for op, n in counts[1].items():
+                    skipped[op] = skipped.get(op, 0) + n
+        self._skip_retired[0] = texts
+        self._skip_live = live
+
+    def _admitted_word_ops(self, profile, skipped):
+        # an op also runs if an earlier op may write one of the characters it needs
+        chars = profile.chars
+        word_ops = []
+        for op, entry, needed, written in self._word_op_gates:
+            if needed is None or not needed.isdisjoint(chars):
+                word_ops.append(entry)
+                if written:
+                    chars = chars | written
+            else:
+                skipped.append(op)
+        return word_ops
 
-        cur_str = '(^|(?<=[\.!?;:\-\(\)\[\]\s]))(([\+\-]{0,1}\d+[\d\.,]*\s*(' \
-                        + rstring_curmagn + '){0,1}\s*' + '(' \
-                        + rstring_cursym_escaped + '))|' + '((' \
-                        + rstring_cursym_escaped + ')\s*[\+\-]{0,1}\d+[\d\.,]*\s*(' \
-                        + rstring_curmagn + '){0,1})|' + '(' \
-                        + rstring_cursym_escaped \
-                        + '))($|(?=[\.!?;:\-\(\)\[\]\s]+))'
+    def transliterate(self, text):
+        if self.cache is None:
+            return self._transliterate(text)
+        namespace = self._namespace()
+        result = self.cache.get(namespace, text)
+        if result is None:
+            result = self._transliterate(text)
+            self.cache.set(namespace, text, result)
+        return result
+
+    def _namespace(self):
+        version = self.lexicon.version if self.lexicon is not None else None
+        cached = self._cache_namespace
+        if cached is None or cached[0] != version:
+            cached = self._cache_namespace = version, self._cache_key()
+        return cached[1]
+
+    def _cache_key(self):
+        # everything the output depends on besides the text: class, pipeline setup and lexicon entries
+        import hashlib
+
+        data = repr((type(self).__module__, type(self).__qualname__, self.pipeline.key,
+                     self.lexicon.digest() if self.lexicon is not None else None))
+        return hashlib.sha256(data.encode('utf-8', 'surrogatepass')).hexdigest()[:32]
+
+    def transliterate_with_alignment(self, text):
+        """
+        Transliterates `text` and maps the output back to the input
 
-        self.regex.DETECT_CURRENCY = re.compile(cur_str)
+        The map is built from the spans each op replaces while it runs, see `polish_transliterate.alignment`.
 
-    def transliterate(self, text):
+        :param text:
+        :return: (transliterated text, alignment.Alignment)
+        """
+        from polish_transliterate.alignment import AlignmentBuilder
+
+        alignment = AlignmentBuilder(len(text))
+        text = self._transliterate(text, alignment)
+        return text, alignment.build()
+
+    def _transliterate(self, text, alignment=None):
         # General note: Polish specific transformations go here
 
-        text = self._mask_acronym(text)
-        if 'acronym_phoneme' in self.transliterate_ops:
-            text = self._acronym_phoneme_op(text)
+        if self.lexicon is not None:
+            text = self.lexicon.apply(text, alignment)
+
+        # ops which provably cannot change the text are skipped, see `TextProfile`
+        skipped = []
+
+        if self.regex.ABBREVIATION_PREFILTER.search(text):
+            acronyms = self._detect_acronyms(text)
+            if 'acronym_phoneme' in self.transliterate_ops:
+                text = self._acronym_phoneme_op(text, acronyms, alignment)
+            else:
+                text = self._mask_acronym(text, acronyms, alignment)
+        else:
+            skipped.append('detect_acronyms')
 
         if self.make_lowercase:
-            text = text.lower()
+            lowered = text.lower()
+            if alignment is not None and len(lowered) != len(text):
+                alignment.add_spans(len(text), [(i, i + 1, c.lower()) for i, c in enumerate(text)
+                                                if len(c.lower()) != 1])
+            text = lowered
 
         if 'accent_peculiarity' in self.transliterate_ops:
-            text = self._accent_peculiarity_op(text)
+            text = self._accent_peculiarity_op(text, alignment)
+
+        profile = TextProfile(text, self.pipeline.profile_pattern)
+        gates = self.pipeline.op_gates
+        matches = None
+        if self.pipeline.merged_detector is not None:
+            admitted = [op for op in self.pipeline.merged_detector.ops if profile.admits(gates[op][0])]
+            matches = self.pipeline.merged_detector.scan(text) if admitted else []
+        if matches is None:
+            for op, method, _ in self.TEXT_OPS:
+                if op in self.transliterate_ops:
+                    needed, written = gates[op]
+                    if profile.admits(needed):
+                        rewritten = getattr(self, method)(text, alignment)
+                        if rewritten is not text:
+                            profile.chars.update(written)
+                            text = rewritten
+                    else:
+                        skipped.append(op)
+        else:
+            skipped.extend(op for op in self.pipeline.merged_detector.ops if op not in admitted)
+            if matches:
+                text = self._merged_text_ops(text, alignment, profile, matches)
+
+        tokens = Tokens(text)
+        self._transliterate_words(tokens, self._admitted_word_ops(profile, skipped))
+        self._count_skipped(skipped)
+        if alignment is not None:
+            alignment.add_tokens(text, tokens)
+        text = tokens.join()
+
+        sep_mask = self.generic_config.SEP_MASK
+        if alignment is None or len(self.sep_abbreviation) == 1:
+            text = text.replace(sep_mask, self.sep_abbreviation)
+        else:
+            text = rewrite_spans(text, ((i, i + 1, self.sep_abbreviation) for i, c in enumerate(text)
+                                        if c == sep_mask), alignment)
+        if alignment is None:
+            return self.regex.DETECT_WHITESPACE_SEQ.sub(' ', text)
+        return rewrite_spans(text, ((m.start(), m.end(), ' ') for m in self.regex.DETECT_WHITESPACE_SEQ.finditer(text)
+                                    if m.group(0) != ' '), alignment)
+
+    def _transliterate_list(self, texts):
+        return [self.transliterate(text) for text in texts]
+
+    def _merged_text_ops(self, text, alignment=None, profile=None, matches=None):
+        try:
+            if matches is None:
+                matches = self.pipeline.merged_detector.scan(text)
+                if matches is None:
+                    # looked up on the class like nested calls, see `_expand_amount_money`
+                    for op, method, _ in self.TEXT_OPS:
+                        if op in self.transliterate_ops:
+                            text = getattr(type(self), method)(self, text, alignment)
+                    return text
+            expanders = self._expanders
+            spans = [(m.start(), m.end(), expanders[m.lastgroup](m)) for m in matches]
+            if profile is not None:
+                for op in {m.lastgroup for m in matches}:
+                    profile.chars.update(self.pipeline.op_gates[op][1])
+            return rewrite_spans(text, spans, alignment)
+        except Exception as e:
+            raise e
 
-        if 'amount_money' in self.transliterate_ops:
-            text = self._amount_money_op(text)
+    def _transliterate_words(self, tokens, word_ops=None):
+        if word_ops is None:
+            word_ops = self._word_ops
+        replace = self.pipeline.replace
+        replace_prefilter = self.pipeline.replace_prefilter
+
+        # words before idx are already transliterated, words after it not yet
+        words = tokens.words
+        flags = tokens.flags
+        count = len(words)
+        # like the split at single spaces, a trailing space leaves an empty last word for the context ops to look
+        # ahead to ("2. " at the end of a text is an ordinal)
+        trailing = count and tokens.ends[-1] < len(tokens.text)
+        if trailing:
+            words.append('')
+        for idx in range(count):
+            word = words[idx]
+            alpha = flags[idx] & TOKEN_ALPHA
+
+            for op, with_context, non_alpha_only in word_ops:
+                if non_alpha_only and alpha:
+                    continue
+                if with_context:
+                    rewritten = op(word, idx, words)
+                else:
+                    rewritten = op(word)
+                if rewritten is not word:
+                    word = rewritten
+                    alpha = word.isalpha()
 
-        if 'date' in self.transliterate_ops:
-            text = self._date_op(text)
+            if replace_prefilter is None or replace_prefilter.search(word):
+                for old, new in replace:
+                    word = word.replace(old, new)
 
-        if 'timestamp' in self.transliterate_ops:
-            text = self._timestamp_op(text)
+            word = self._misc_abbreviation_op(word)
+            word = self._number_unit_op(word, idx, words)
 
-        if 'time_of_day' in self.transliterate_ops:
-            text = self._timeofday_op(text)
+            words[idx] = word
 
-        split_text = text.split(' ')
-        cleaned_words = []
+        if trailing:
+            words.pop()
+        return tokens
 
-        idx = 0
-        for word in split_text:
-            if not word:
-                continue
+    def _make_pool(self, workers, executor=None):
+        """
+        Creates a worker pool for this transliterator
 
-            for tr in self.transliterate_ops:
-                if tr == 'weekday':
-                    word = self._weekday_op(word)
-                elif tr == 'month':
-                    word = self._month_op(word)
-                elif tr == 'ordinal':
-                    word = self._ordinal_op(word, idx, split_text, cleaned_words)
-                elif tr == 'special':
-                    word = self._special_op(word)
-                elif tr == 'math_symbol':
-                    word = self._math_symbol_op(word)
-                elif tr == 'spoken_symbol':
-                    word = self._spoken_symbol_op(word, idx, split_text)
-
-            for old, new in self.replace.items():
-                word = word.replace(old, new)
+        :param workers: number of workers
+        :param executor: 'process' or 'thread', see `transliterate_many`
+        :return: (pool, callable transliterating a list of texts in a worker)
+        """
+        if executor is None:
+            executor = 'process' if _gil_enabled() else 'thread'
+        if executor == 'process':
+            from concurrent.futures import ProcessPoolExecutor
+
+            options = {'number_words': self.number_words, 'lexicon': self.lexicon, 'cache': self.cache}
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(type(self), self.pipeline, options))
+            return pool, _transliterate_chunk
+        if executor == 'thread':
+            from concurrent.futures import ThreadPoolExecutor
+            return ThreadPoolExecutor(max_workers=workers), self._transliterate_list
+        raise ValueError('unknown executor: ' + repr(executor))
+
+    def transliterate_many(self, texts, workers=None, chunksize=256, executor=None):
+        """
+        Transliterates an iterable of texts, yielding the results in input order
 
-            word = self._misc_abbreviation_op(word)
-            word = self._number_unit_op(word, idx, cleaned_words)
+        The input is consumed lazily in chunks, at most `2 * workers` chunks are in flight at any time.
 
-            cleaned_words.append(word)
-            idx += 1
+        :param texts: iterable of strings
+        :param workers: number of parallel workers, defaults to the number of CPUs; 1 runs in-process
+        :param chunksize: number of texts sent to a worker at once
+        :param executor: 'process' or 'thread', defaults to threads on free-threaded Python builds
+                         and to processes otherwise
+        :return: generator of transliterated strings
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            for text in texts:
+                yield self.transliterate(text)
+            return
+
+        pool, work = self._make_pool(workers, executor)
+        it = iter(texts)
+        with pool:
+            pending = deque()
+            try:
+                while True:
+                    while len(pending) < 2 * workers:
+                        chunk = list(itertools.islice(it, chunksize))
+                        if not chunk:
+                            break
+                        pending.append(pool.submit(work, chunk))
+                    if not pending:
+                        break
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _detect_acronyms(self, text):
+        """
+        Span table of the acronyms in `text` which are not excluded
 
-        text = ' '.join(cleaned_words).replace(self.generic_config.SEP_MASK, self.sep_abbreviation)
-        return self.regex.DETECT_WHITESPACE_SEQ.sub(' ', text)
+        :param text:
+        :return: list of (start, end, acronym) tuples
+        """
+        exclude = self.acronym_phoneme_config.EXCLUDE
+        return [(m.start(), m.end(), m.group(0)) for m in self.regex.DETECT_ABBREVIATION.finditer(text)
+                if m.group(0) not in exclude]
 
-    def _mask_acronym(self, text):
+    def _mask_acronym(self, text, acronyms=None, alignment=None):
         try:
-            abbr_expanded = []
-            for abbr in self.regex.DETECT_ABBREVIATION.finditer(text):
-                if abbr.group(0) not in self.acronym_phoneme_config.EXCLUDE:
-                    abbr_expanded.append(
-                        (abbr.group(0), self.generic_config.SEP_MASK.join([c for c in
-                            abbr.group(0).replace('.', '')
-                        ])))
-            for m in abbr_expanded:
-                text = text.replace(m[0], m[1], 1)
-
-            return text
+            if acronyms is None:
+                acronyms = self._detect_acronyms(text)
+            mask = self.pipeline.mask_acronym
+            return rewrite_spans(text, ((start, end, mask(acronym)) for start, end, acronym in acronyms), alignment)
         except Exception as e:
             raise e
 
-    def _acronym_phoneme_op(self, text):
+    def _acronym_phoneme_op(self, text, acronyms=None, alignment=None):
         try:
-            abbr_expanded = []
-            for abbr in self.regex.DETECT_ABBREVIATION.finditer(text):
-                if abbr.group(0) not in self.acronym_phoneme_config.EXCLUDE:
-                    abbr_expanded.append(
-                        (abbr.group(0), self.generic_config.SEP_MASK.join([
-                            self.acronym_phoneme_config.LETTER[c] for c in
-                            abbr.group(0).replace('.', '')
-                        ])))
-            for m in abbr_expanded:
-                text = text.replace(m[0], m[1], 1)
-
-            return text
+            if acronyms is None:
+                acronyms = self._detect_acronyms(text)
+            spell = self.pipeline.spell_acronym
+            return rewrite_spans(text, ((start, end, spell(acronym)) for start, end, acronym in acronyms), alignment)
         except Exception as e:
             raise e
 
-    def _accent_peculiarity_op(self, text):
+    def _accent_peculiarity_op(self, text, alignment=None):
         try:
-            for chars, mapped in self.generic_config.UNICODE_TO_ASCII.items():
-                text = re.sub('|'.join([c for c in chars]), mapped, text)
-
-            return text
+            if text.isascii():
+                return text
+            if alignment is not None:
+                table = self.pipeline.accent_table
+                return rewrite_spans(text, ((i, i + 1, table[ord(c)]) for i, c in enumerate(text)
+                                            if ord(c) in table and len(table[ord(c)]) != 1), alignment) \
+                    .translate(table)
+            return text.translate(self.pipeline.accent_table)
         except Exception as e:
             raise e
 
-    def _amount_money_op(self, text):
+    def _amount_money_op(self, text, alignment=None):
         try:
-            diff_len = 0
-            for mc in self.regex.DETECT_CURRENCY.finditer(text):
-                match_currency = self._acronym_phoneme_op(mc.group(0))
-                mc_end = mc.end()
-
-                m_symbol = self.regex.DETECT_CURRENCY_SYMBOL.search(match_currency)
-                m_magnitude = self.regex.DETECT_CURRENCY_MAGNITUDE.search(match_currency)
-                m_number = self.regex.DETECT_NUMBER.search(match_currency)
-
-                number = m_number.group(0) if m_number else ''
-                if not m_magnitude and ',' in number:
-                    cur_symbol = self.abbreviation_config.CURRENCY_SYMBOL[
-                                                        m_symbol.group(0).replace(self.generic_config.SEP_MASK, '_')]
-                    number = number.replace(',', ' ' + cur_symbol + ' ')
-                    dec_start = number.rfind(' ' + cur_symbol)+len(cur_symbol)+2
-                    decimals = number[dec_start:]
-                    if int(decimals) == 0:
-                        number = number[:dec_start]
-                    elif len(decimals) > 2:
-                        number = number[:dec_start] + ' ' + decimals[0:2] + ' ' + ' '.join(decimals[2:])
-                    rearranged_currency_term = number
-                else:
-                    rearranged_currency_term = number + ' ' if m_number else ''
-                    rearranged_currency_term += m_magnitude.group(0) + ' ' if m_magnitude else ''
-                    rearranged_currency_term += self.abbreviation_config.CURRENCY_SYMBOL[
-                        m_symbol.group(0).replace(self.generic_config.SEP_MASK, '_')]
-                text = text[:mc.start() + diff_len] + rearranged_currency_term + text[mc_end + diff_len:]
-                diff_len = len(rearranged_currency_term) - (mc_end - (mc.start() + diff_len))
-
-            return text
+            return rewrite_matches(self.regex.DETECT_CURRENCY, text, self._expand_amount_money, alignment)
         except Exception as e:
             raise e
 
-    def _date_op(self, text):
+    def _expand_amount_money(self, mc):
+        # looked up on the class, a profiler's wrapper would count the nested call as an acronym_phoneme op
+        match_currency = type(self)._acronym_phoneme_op(self, mc.group(0))
+
+        m_symbol = self.regex.DETECT_CURRENCY_SYMBOL.search(match_currency)
+        m_magnitude = self.regex.DETECT_CURRENCY_MAGNITUDE.search(match_currency)
+        m_number = self.regex.DETECT_NUMBER.search(match_currency)
+
+        number = m_number.group(0) if m_number else ''
+        if not m_magnitude and ',' in number:
+            cur_symbol = self.abbreviation_config.CURRENCY_SYMBOL[
+                                                m_symbol.group(0).replace(self.generic_config.SEP_MASK, '_')]
+            number = number.replace(',', ' ' + cur_symbol + ' ')
+            dec_start = number.rfind(' ' + cur_symbol)+len(cur_symbol)+2
+            decimals = number[dec_start:]
+            if int(decimals) == 0:
+                number = number[:dec_start]
+            elif len(decimals) > 2:
+                number = number[:dec_start] + ' ' + decimals[0:2] + ' ' + ' '.join(decimals[2:])
+            rearranged_currency_term = number
+        else:
+            rearranged_currency_term = number + ' ' if m_number else ''
+            rearranged_currency_term += m_magnitude.group(0) + ' ' if m_magnitude else ''
+            rearranged_currency_term += self.abbreviation_config.CURRENCY_SYMBOL[
+                m_symbol.group(0).replace(self.generic_config.SEP_MASK, '_')]
+        return rearranged_currency_term
+
+    def _date_op(self, text, alignment=None):
         try:
-            for date_m in self.regex.DETECT_DATE.finditer(text):
-                frags = date_m.group(0).split('.')
-                if ' ' in frags[-1]:
-                    space_split = frags[-1].strip().split(' ')
-                    del (frags[-1])
-                    frags.extend(space_split)
-                day = num2words(frags[0], lang='pl', to='ordinal')
-                if date_m.start() > 1 and text[date_m.start() - 2:date_m.start()] in ('m ', 'n '):
-                    day += 'n'
-                if frags[1].strip() in self.abbreviation_config.MONTH:
-                    month = self.abbreviation_config.MONTH[frags[1].strip()]
-                else:
-                    month = self.abbreviation_config.NUMBER_MONTH[frags[1].strip()]
-                year = ''
-                if len(frags) == 3 and frags[2]:
-                    year = num2words(frags[2], lang='pl', to='year')
-                text = self.regex.DETECT_DATE.sub(day + ' ' + month + (' ' + year if year else ''), text, count=1)
-
-            return text
+            return rewrite_matches(self.regex.DETECT_DATE, text, self._expand_date, alignment)
         except Exception as e:
             raise e
 
-    def _timestamp_op(self, text):
+    def _expand_date(self, date_m):
+        text = date_m.string
+        frags = date_m.group(0).split('.')
+        if ' ' in frags[-1]:
+            space_split = frags[-1].strip().split(' ')
+            del (frags[-1])
+            frags.extend(space_split)
+        day = self.number_words.ordinal(frags[0])
+        if date_m.start() > 1 and text[date_m.start() - 2:date_m.start()] in ('m ', 'n '):
+            day += 'n'
+        if frags[1].strip() in self.abbreviation_config.MONTH:
+            month = self.abbreviation_config.MONTH[frags[1].strip()]
+        else:
+            month = self.abbreviation_config.NUMBER_MONTH[frags[1].strip()]
+        year = ''
+        if len(frags) == 3 and frags[2]:
+            year = self.number_words.year(frags[2])
+        return day + ' ' + month + (' ' + year if year else '')
+
+    def _timestamp_op(self, text, alignment=None):
         try:
-            for timestamp_m in self.regex.DETECT_TIMESTAMP.finditer(text):
-                ts = timestamp_m.group(0)
-                ts_split = ts.split(':')
-                if len(ts_split) == 2:
-                    if int(ts_split[0].replace('h', '').replace('std', '')) == 1:
-                        ts = 'jedna godzina '
-                    else:
-                        ts = ts_split[0] + ' godzin '
-                    if int(ts_split[1].replace('m', '').replace('min', '')) == 1:
-                        ts += 'jedna minuta'
-                    else:
-                        ts += ts_split[1] + ' minut'
-                else:
-                    if int(ts_split[0].replace('h', '').replace('std', '')) == 1:
-                        ts = 'jedna godzina '
-                    else:
-                        ts = ts_split[0] + ' godzin '
-                    if int(ts_split[1].replace('min', '').replace('m', '')) == 1:
-                        ts += 'jedna minuta '
-                    else:
-                        ts += ts_split[1].replace('min', '').replace('m', '') + ' minut '
-                    if int(ts_split[2].replace('sek', '').replace('sec', '').replace('s', '')) == 1:
-                        ts += 'jedna sekunda'
-                    else:
-                        ts += ts_split[2].replace('sek', '').replace('sec', '').replace('s', '') + ' sekund'
-
-                text = text[:timestamp_m.start()] + ts + text[timestamp_m.end():]
-
-            return text
+            return rewrite_matches(self.regex.DETECT_TIMESTAMP, text, self._expand_timestamp, alignment)
         except Exception as e:
             raise e
 
-    def _timeofday_op(self, text):
+    def _expand_timestamp(self, timestamp_m):
+        ts = timestamp_m.group(0)
+        ts_split = ts.split(':')
+        if len(ts_split) == 2:
+            if int(ts_split[0].replace('h', '').replace('std', '')) == 1:
+                ts = 'jedna godzina '
+            else:
+                ts = ts_split[0] + ' godzin '
+            if int(ts_split[1].replace('m', '').replace('min', '')) == 1:
+                ts += 'jedna minuta'
+            else:
+                ts += ts_split[1] + ' minut'
+        else:
+            if int(ts_split[0].replace('h', '').replace('std', '')) == 1:
+                ts = 'jedna godzina '
+            else:
+                ts = ts_split[0] + ' godzin '
+            if int(ts_split[1].replace('min', '').replace('m', '')) == 1:
+                ts += 'jedna minuta '
+            else:
+                ts += ts_split[1].replace('min', '').replace('m', '') + ' minut '
+            if int(ts_split[2].replace('sek', '').replace('sec', '').replace('s', '')) == 1:
+                ts += 'jedna sekunda'
+            else:
+                ts += ts_split[2].replace('sek', '').replace('sec', '').replace('s', '') + ' sekund'
+        return ts
+
+    def _timeofday_op(self, text, alignment=None):
         try:
-            for time_m in self.regex.DETECT_TIME_OF_DAY.finditer(text):
-                tod = text[time_m.start():time_m.end()].replace('uhr', '').replace('h', '').replace(':',
-                                                                                                    ' godzina ').replace(
-                    '.', ' godzina ')
-                if int(tod.split(' godzina ')[0]) == 1:
-                    tod = 'jedna godzina ' + tod.split(' godzina ')[1]
-                text = text[:time_m.start()] + tod + text[time_m.end():]
-
-            return text
+            return rewrite_matches(self.regex.DETECT_TIME_OF_DAY, text, self._expand_timeofday, alignment)
         except Exception as e:
             raise e
 
+    def _expand_timeofday(self, time_m):
+        tod = time_m.group(0).replace('uhr', '').replace('h', '').replace(':', ' godzina ').replace('.', ' godzina ')
+        if int(tod.split(' godzina ')[0]) == 1:
+            tod = 'jedna godzina ' + tod.split(' godzina ')[1]
+        return tod
+
     def _weekday_op(self, word):
         try:
-            ms = self.regex.DETECT_WEEKDAY.finditer(word)
-            offset = 0
-            for m in ms:
-                _word = word[m.start() + offset:m.end() + offset].replace('.', '')
-                if _word in self.abbreviation_config.WEEKDAY:
-                    word = word[:m.start() + offset] + self.abbreviation_config.WEEKDAY[_word] + word[m.end() + offset:]
-                    offset += len(self.abbreviation_config.WEEKDAY[_word]) - (m.end() - m.start())
-
-            if offset > 0:
-                return word.replace('.', '')
-            else:
-                return word
-
+            replaced = lookup_word(self.pipeline.weekday_index, word)
+            return word if replaced is None else replaced
         except Exception as e:
             raise e
 
     def _month_op(self, word):
         try:
-            ms = self.regex.DETECT_MONTH.finditer(word)
-            offset = 0
-            for m in ms:
-                _word = word[m.start() + offset:m.end() + offset].replace('.', '')
-                if _word in self.abbreviation_config.MONTH:
-                    word = word[:m.start() + offset] + self.abbreviation_config.MONTH[_word] + word[m.end() + offset:]
-                    offset += len(self.abbreviation_config.MONTH[_word]) - (m.end() - m.start())
-
-            if offset > 0:
-                return word.replace('.', '')
-            else:
-                return word
-
+            replaced = lookup_word(self.pipeline.month_index, word)
+            return word if replaced is None else replaced
         except Exception as e:
             raise e
 
-    def _ordinal_op(self, word, idx, split_text, cleaned):
+    def _ordinal_op(self, word, idx, words):
         try:
             if self.regex.DETECT_ORDINAL.match(word) and word.endswith('.'):
-                if idx < (len(split_text) - 1) \
-                        and split_text[idx + 1] not in self.abbreviation_config.CURRENCY_SYMBOL.values():
-                    word = num2words(word, lang='pl', to='ordinal')
-                    if idx > 0 and idx < (len(split_text) - 1):
-                        if cleaned[idx - 1].endswith('m'):
+                if idx < (len(words) - 1) \
+                        and words[idx + 1] not in self.abbreviation_config.CURRENCY_SYMBOL.values():
+                    word = self.number_words.ordinal(word)
+                    if idx > 0 and idx < (len(words) - 1):
+                        if words[idx - 1].endswith('m'):
                             word += 'n'
 
             return word
@@ -574,9 +1563,12 @@ class PolishTransliterate:
 
     def _special_op(self, word):
         try:
-            for pat, tup_repl in self.regex.SPECIAL_TRANSLITERATE.items():
-                if re.search(pat, word):
-                    word = word.replace(tup_repl[0], tup_repl[1], 1)
+            if not self.regex.SPECIAL_PREFILTER.search(word) or not self.regex.DETECT_SPECIAL.search(word):
+                return word
+
+            for pat, old, new in self.regex.SPECIAL_TRANSLITERATE_COMPILED:
+                if pat.search(word):
+                    word = word.replace(old, new, 1)
                     ws = []
                     for w in word.split(' '):
                         if self.regex.DETECT_NUMBER.match(w):
@@ -612,7 +1604,7 @@ class PolishTransliterate:
         except Exception as e:
             raise e
 
-    def _spoken_symbol_op(self, word, idx, split_text):
+    def _spoken_symbol_op(self, word, idx, words):
         try:
             for pats, repl in self.abbreviation_config.SPOKEN_SYMBOL.items():
                 if pats[0] in word:
@@ -620,10 +1612,9 @@ class PolishTransliterate:
                     if pats[1] in word:
                         word = word.replace(pats[1], self.generic_config.SEP_MASK)
                     else:
-                        for fwd_idx in range(idx + 1, len(split_text)):
-                            if pats[1] in split_text[fwd_idx]:
-                                split_text[fwd_idx] = split_text[fwd_idx].replace(pats[1],
-                                                                                  self.generic_config.SEP_MASK)
+                        for fwd_idx in range(idx + 1, len(words)):
+                            if pats[1] in words[fwd_idx]:
+                                words[fwd_idx] = words[fwd_idx].replace(pats[1], self.generic_config.SEP_MASK)
                                 break
 
             return word
@@ -632,16 +1623,12 @@ class PolishTransliterate:
 
     def _misc_abbreviation_op(self, word):
         try:
-            for short, long in self.abbreviation_config.MISC.items():
-                if long not in word:
-                    if (short + '.') == word or short == word:
-                        word = long
-
-            return word
+            replaced = lookup_word(self.pipeline.misc_index, word)
+            return word if replaced is None else replaced
         except Exception as e:
             raise e
 
-    def _number_unit_op(self, word, idx, cleaned_words):
+    def _number_unit_op(self, word, idx, words):
         try:
             w_unit = word
             if w_unit.endswith('.'):
@@ -650,25 +1637,25 @@ class PolishTransliterate:
 
             if w_unit in self.unit_config.PLURAL_NO_SUFFIX.keys():
                 word = self.unit_config.PLURAL_NO_SUFFIX[w_unit]
-                if idx > 0 and cleaned_words[idx - 1] == ('jeden'):
-                    cleaned_words[idx - 1] = 'jedna'
+                if idx > 0 and words[idx - 1] == ('jeden'):
+                    words[idx - 1] = 'jedna'
             elif w_unit in self.unit_config.PLURAL_SUFFIX_EN.keys():
                 word = self.unit_config.PLURAL_SUFFIX_EN[w_unit]
-                if idx > 0 and (cleaned_words[idx - 1] == ('jeden')
-                                or cleaned_words[idx - 1] == ('jedna')
-                                or cleaned_words[idx - 1] == ('jedną')):
+                if idx > 0 and (words[idx - 1] == ('jeden')
+                                or words[idx - 1] == ('jedna')
+                                or words[idx - 1] == ('jedną')):
                     word = word[:-2]
-                    cleaned_words[idx - 1] = 'jedna'
+                    words[idx - 1] = 'jedna'
 
             elif w_unit in self.unit_config.PLURAL_SUFFIX_N.keys():
                 word = self.unit_config.PLURAL_SUFFIX_N[w_unit]
-                if idx > 0 and (cleaned_words[idx - 1] == ('jeden')
-                                or cleaned_words[idx - 1] == ('jedna')
-                                or cleaned_words[idx - 1] == ('jedną')):
+                if idx > 0 and (words[idx - 1] == ('jeden')
+                                or words[idx - 1] == ('jedna')
+                                or words[idx - 1] == ('jedną')):
                     word = word[:-1]
-                    cleaned_words[idx - 1] = 'jedna'
+                    words[idx - 1] = 'jedna'
 
-            num_match = self.regex.DETECT_NUMBER.match(word)
+            num_match = None if word.isalpha() else self.regex.DETECT_NUMBER.match(word)
             if num_match:
 
                 w_unit = word[num_match.end():]
@@ -710,12 +1697,12 @@ class PolishTransliterate:
             try:
                 if number.count(',') == 1:
                     number = number.replace(',', '.')
-                    word = num2words(float(number), lang='pl', to='cardinal').lower()
+                    word = self.number_words.cardinal(float(number)).lower()
                 elif number.count('.') >= 1:
                     number = number.replace('.', '')
-                    word = num2words(int(number), lang='pl', to='cardinal').lower()
+                    word = self.number_words.cardinal(int(number)).lower()
                 else:
-                    word = num2words(int(number), lang='pl', to='cardinal').lower()
+                    word = self.number_words.cardinal(int(number)).lower()
             except ValueError:
                 word = number
             return word
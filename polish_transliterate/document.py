@@ -0,0 +1,132 @@
+"""
+Memory-bounded transliteration of very large documents (e.g. book dumps)
+
+`transliterate` holds several full copies of its input (lowercased text, the output of each op, tokens, joined and
+whitespace-collapsed text). `DocumentTransliterator` instead reads a document from a file object or `mmap` in
+windows, transliterates each window up to its last safe cut (see `streaming.SafeCuts`: no date, amount, timestamp,
+number or bracket pair is ever split) and writes the output incrementally, so peak memory is proportional to the
+window size rather than to the document:
+
+    with open('book.txt', 'rb') as source, open('book_normalized.txt', 'w', encoding='utf-8') as target:
+        DocumentTransliterator(transliterator).transliterate_file(source, target)
+
+The output equals `PolishTransliterate.transliterate` of the whole document (all whitespace, line breaks included,
+collapses to single spaces). Only text without a safe cut for `max_window` characters is cut at its last whitespace
+anyway; `stats()` counts these forced cuts.
+"""
+import codecs
+import io
+
+from polish_transliterate.core import PolishTransliterate
+from polish_transliterate.streaming import StreamingTransliterator
+
+DEFAULT_WINDOW = 1 << 20
+
+
+class DocumentTransliterator:
+    """
+    Windowed front end of `PolishTransliterate` for documents too large to transliterate at once
+    """
+
+    def __init__(self, transliterator=None, window=DEFAULT_WINDOW, max_window=None, encoding='utf-8',
+                 errors='strict', **options):
+        """
+        Constructor
+
+        :param transliterator: PolishTransliterate to use, otherwise one is created from `options`
+        :param window: characters (bytes for binary sources) read at once
+        :param max_window: max. characters held back without a safe cut, defaults to 4 * window
+        :param encoding: encoding of binary sources and targets
+        :param errors: error handling of the encoding, see `codecs`
+        :param options: keyword arguments for `PolishTransliterate`
+        """
+        if transliterator is None:
+            transliterator = PolishTransliterate(**options)
+        if window < 1:
+            raise ValueError('window must be positive')
+        self.transliterator = transliterator
+        self.window = window
+        self.max_window = max_window or 4 * window
+        self.encoding = encoding
+        self.errors = errors
+        self._stream = StreamingTransliterator(transliterator, max_pending=self.max_window)
+        self.clear()
+
+    def clear(self):
+        """
+        Resets the statistics
+        """
+        self._documents = self._windows = self._chars_in = self._chars_out = self._forced_cuts = 0
+
+    def stats(self):
+        """
+        Returns statistics, accumulated over all documents
+
+        :return: dict(documents, windows, chars_in, chars_out, forced_cuts)
+        """
+        return {'documents': self._documents, 'windows': self._windows, 'chars_in': self._chars_in,
+                'chars_out': self._chars_out, 'forced_cuts': self._forced_cuts}
+
+    def read_windows(self, source):
+        """
+        Reads a document in windows, decoding binary input incrementally (a character is never split)
+
+        :param source: file object opened for reading (text or binary) or mmap.mmap
+        :return: generator of str
+        """
+        decoder = None
+        while True:
+            data = source.read(self.window)
+            if not data:
+                break
+            if not isinstance(data, str):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(self.encoding)(self.errors)
+                data = decoder.decode(data)
+            if data:
+                yield data
+        if decoder is not None:
+            data = decoder.decode(b'', final=True)
+            if data:
+                yield data
+
+    def transliterate_windows(self, windows):
+        """
+        Transliterates a document given as consecutive pieces of text
+
+        :param windows: iterable of str
+        :return: generator of str, the output in pieces as soon as it is final
+        """
+        stream = self._stream
+        stream.reset()
+        forced_cuts = stream.forced_cuts
+        self._documents += 1
+        try:
+            for window in windows:
+                self._windows += 1
+                self._chars_in += len(window)
+                output = stream.feed(window)
+                if output:
+                    self._chars_out += len(output)
+                    yield output
+            output = stream.flush()
+            if output:
+                self._chars_out += len(output)
+                yield output
+        finally:
+            self._forced_cuts += stream.forced_cuts - forced_cuts
+
+    def transliterate_file(self, source, target):
+        """
+        Transliterates a document from `source` to `target`
+
+        :param source: file object opened for reading (text or binary) or mmap.mmap
+        :param target: file object opened for writing, binary targets get the output encoded with `encoding`
+        :return: number of characters written
+        """
+        binary = not isinstance(target, io.TextIOBase)
+        written = 0
+        for output in self.transliterate_windows(self.read_windows(source)):
+            target.write(output.encode(self.encoding, self.errors) if binary else output)
+            written += len(output)
+        return written
@@ -0,0 +1,218 @@
+"""
+Large user lexicons (brand names, domain abbreviations, pronunciation overrides) applied in one pass over the text
+
+A `Lexicon` compiles its entries into an Aho-Corasick automaton once; it can be saved to disk and loaded by workers
+without rebuilding it. Pass it as `PolishTransliterate(lexicon=...)` to apply it before all other ops.
+"""
+import hashlib
+import pickle
+
+from polish_transliterate.core import rewrite_spans
+
+FORMAT_VERSION = 1
+
+
+def _fold(c):
+    # per-character lowercase which keeps offsets intact
+    lower = c.lower()
+    return lower if len(lower) == 1 else c
+
+
+class Lexicon:
+    """
+    Multi-pattern replacement with word-boundary handling and leftmost-longest match semantics
+    """
+
+    def __init__(self, entries=None, case_sensitive=False):
+        """
+        Constructor
+
+        :param entries: dict (or iterable of pairs) of term -> replacement; of several entries for the same term
+                        (after case folding) the last one wins
+        :param case_sensitive: if False, terms match regardless of case
+        """
+        self.case_sensitive = case_sensitive
+        # automaton: goto transitions, failure links and, per state, the lengths of the terms ending there
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._values = {}
+        # bumped by `add`, so users of `digest` notice changes without rehashing the entries
+        self.version = 0
+        self._digest = None
+        if entries:
+            self._build(entries.items() if isinstance(entries, dict) else entries)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, term):
+        return self._normalize(term) in self._values
+
+    def _normalize(self, term):
+        return term if self.case_sensitive else ''.join(map(_fold, term))
+
+    def _build(self, entries):
+        goto, out, values = self._goto, self._out, self._values
+        for term, replacement in entries:
+            if not term:
+                continue
+            key = self._normalize(term)
+            known = key in values
+            # a later entry for the same term wins, its path is in the automaton already
+            values[key] = replacement
+            if known:
+                continue
+            state = 0
+            for c in key:
+                nxt = goto[state].get(c)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][c] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] = (len(key),)
+
+        # breadth-first failure links, outputs are merged along the failure chain
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for c, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and c not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(c, 0)
+                fail[nxt] = target if target != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+        self._fail = fail
+
+    def add(self, entries):
+        """
+        Adds entries and rebuilds the automaton; an entry for a term already in the lexicon replaces it
+
+        :param entries: dict (or iterable of pairs) of term -> replacement
+        """
+        items = list(self._values.items())
+        items.extend(entries.items() if isinstance(entries, dict) else entries)
+        self._goto, self._fail, self._out, self._values = [{}], [0], [()], {}
+        self._build(items)
+        self.version += 1
+        self._digest = None
+
+    def find(self, text):
+        """
+        Finds the lexicon terms in `text`, leftmost-longest and non-overlapping; a term starting (ending) with
+        a letter or digit only matches if it is not preceded (followed) by one
+
+        :param text:
+        :return: list of (start, end, replacement) tuples
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        folded = text if self.case_sensitive else ''.join(map(_fold, text))
+        n = len(folded)
+
+        longest = {}
+        state = 0
+        for i, c in enumerate(folded):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for length in out[state]:
+                start = end - length
+                if folded[start].isalnum() and start > 0 and folded[start - 1].isalnum():
+                    continue
+                if c.isalnum() and end < n and folded[end].isalnum():
+                    continue
+                if longest.get(start, 0) < end:
+                    longest[start] = end
+
+        spans = []
+        pos = 0
+        for start in sorted(longest):
+            if start >= pos:
+                end = longest[start]
+                spans.append((start, end, self._values[folded[start:end]]))
+                pos = end
+        return spans
+
+    def apply(self, text, alignment=None):
+        """
+        Replaces all lexicon terms in `text` in one pass
+
+        :param text:
+        :param alignment: optional `alignment.AlignmentBuilder` recording the replaced spans
+        :return: str
+        """
+        if not self._values:
+            return text
+        return rewrite_spans(text, self.find(text), alignment)
+
+    def digest(self):
+        """
+        Content hash of the entries, e.g. to key cached results
+
+        :return: str
+        """
+        if self._digest is None:
+            data = repr((self.case_sensitive, sorted(self._values.items()))).encode('utf-8', 'surrogatepass')
+            self._digest = hashlib.sha256(data).hexdigest()
+        return self._digest
+
+    def __getstate__(self):
+        return FORMAT_VERSION, self.case_sensitive, self._goto, self._fail, self._out, self._values
+
+    def __setstate__(self, state):
+        version, self.case_sensitive, self._goto, self._fail, self._out, self._values = state
+        if version != FORMAT_VERSION:
+            raise ValueError('unsupported lexicon format version: ' + repr(version))
+        self.version = 0
+        self._digest = None
+
+    def save(self, path):
+        """
+        Saves the compiled lexicon, see `load`
+
+        :param path:
+        """
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a lexicon saved with `save` without rebuilding the automaton
+
+        :param path:
+        :return: Lexicon
+        """
+        with open(path, 'rb') as f:
+            lexicon = pickle.load(f)
+        if not isinstance(lexicon, cls):
+            raise TypeError('not a ' + cls.__name__ + ': ' + path)
+        return lexicon
+
+    @classmethod
+    def from_tsv(cls, path, case_sensitive=False):
+        """
+        Builds a lexicon from a UTF-8 file with one `term<TAB>replacement` entry per line (empty lines and
+        lines starting with '#' are skipped)
+
+        :param path:
+        :param case_sensitive:
+        :return: Lexicon
+        """
+        entries = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\r\n')
+                if not line or line.startswith('#'):
+                    continue
+                term, _, replacement = line.partition('\t')
+                entries.append((term, replacement))
+        return cls(entries, case_sensitive=case_sensitive)
@@ -0,0 +1,188 @@
+"""
+Per-op timing instrumentation for `PolishTransliterate(profiler=...)`
+
+A `Profiler` wraps the op methods of the transliterators it is attached to and records wall time, call count,
+matches and bytes in/out (UTF-8) per op. Transliterators without a profiler are not instrumented at all; once a
+profiler is attached, the span rewriter counts the spans each op replaces (see `core.enable_span_counting`).
+
+    profiler = Profiler()
+    transliterator = PolishTransliterate(profiler=profiler)
+    ...
+    profiler.report()
+"""
+import sys
+import threading
+import time
+from functools import partial
+
+from polish_transliterate.core import Tokens, counted_spans, enable_span_counting
+
+# op name -> method of PolishTransliterate; 'words' is the whole per-word loop (including the word ops below it),
+# 'merged_text_ops' the single pass of the merged engine, 'transliterate' the whole pipeline
+PROFILED_OPS = {
+    'transliterate': '_transliterate',
+    'detect_acronyms': '_detect_acronyms',
+    'acronym_phoneme': '_acronym_phoneme_op',
+    'mask_acronym': '_mask_acronym',
+    'accent_peculiarity': '_accent_peculiarity_op',
+    'amount_money': '_amount_money_op',
+    'date': '_date_op',
+    'timestamp': '_timestamp_op',
+    'time_of_day': '_timeofday_op',
+    'merged_text_ops': '_merged_text_ops',
+    'words': '_transliterate_words',
+    'weekday': '_weekday_op',
+    'month': '_month_op',
+    'ordinal': '_ordinal_op',
+    'special': '_special_op',
+    'math_symbol': '_math_symbol_op',
+    'spoken_symbol': '_spoken_symbol_op',
+    'misc_abbreviation': '_misc_abbreviation_op',
+    'number_unit': '_number_unit_op',
+}
+
+# ops called once per word, see `Profiler.wrap`
+WORD_LEVEL_OPS = frozenset(('weekday', 'month', 'ordinal', 'special', 'math_symbol', 'spoken_symbol',
+                            'misc_abbreviation', 'number_unit'))
+
+
+def _size(value):
+    # UTF-8 size in bytes
+    if type(value) is str:
+        return len(value.encode('utf-8', 'surrogatepass'))
+    if type(value) is Tokens:
+        # size of the joined words, the word loop rewrites them in place
+        return sum(len(word.encode('utf-8', 'surrogatepass')) for word in value.words) + max(len(value.words) - 1, 0)
+    return 0
+
+
+def _folded_chars(table, text, result):
+    # accent folding translates instead of rewriting spans, every character it maps is a match
+    return sum(1 for c in text if ord(c) in table) if result != text else 0
+
+
+class OpStats:
+    """
+    Accumulated measurements of one op
+    """
+
+    __slots__ = ('calls', 'seconds', 'matches', 'bytes_in', 'bytes_out')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.matches = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Profiler:
+    """
+    Collects per-op statistics of instrumented transliterators (thread-safe)
+    """
+
+    def __init__(self, callback=None):
+        """
+        Constructor
+
+        :param callback: optional callable(op, seconds, bytes_in, bytes_out, matches) invoked after every op call,
+                         e.g. to export to a metrics system
+        """
+        self.callback = callback
+        self._ops = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, transliterator):
+        """
+        Replaces the op methods of `transliterator` by timed wrappers (called by `PolishTransliterate`)
+
+        :param transliterator: PolishTransliterate
+        """
+        enable_span_counting()
+        counts = {'accent_peculiarity': partial(_folded_chars, transliterator.pipeline.accent_table)}
+        for op, method in PROFILED_OPS.items():
+            setattr(transliterator, method, self.wrap(op, getattr(transliterator, method), counts.get(op)))
+
+    def wrap(self, op, func, count=None):
+        """
+        Returns a timed wrapper of `func`; its first argument is the op input (text, word or tokens)
+
+        The matches of a call are the spans it rewrote (for 'transliterate' those of all text-level ops), for ops
+        returning lists (acronym detection) the items; ops called per word match if they changed the word.
+
+        :param op: op name
+        :param func: op method
+        :param count: optional callable(input, result) returning the matches of a call instead, run untimed
+        """
+        clock = time.perf_counter
+        record = self.record
+        per_word = op in WORD_LEVEL_OPS
+
+        def timed(value, *args, **kwargs):
+            bytes_in = _size(value)
+            spans = counted_spans()
+            start = clock()
+            result = func(value, *args, **kwargs)
+            seconds = clock() - start
+            if count is not None:
+                matches = count(value, result)
+            elif type(result) is list:
+                matches = len(result)
+            elif per_word:
+                matches = 1 if result != value else 0
+            else:
+                matches = counted_spans() - spans
+            record(op, seconds, bytes_in, _size(result), matches)
+            return result
+
+        timed.__wrapped__ = func
+        return timed
+
+    def record(self, op, seconds, bytes_in, bytes_out, matches):
+        with self._lock:
+            stats = self._ops.get(op)
+            if stats is None:
+                stats = self._ops[op] = OpStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.matches += matches
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+        if self.callback is not None:
+            self.callback(op, seconds, bytes_in, bytes_out, matches)
+
+    def stats(self):
+        """
+        Returns the statistics per op
+
+        :return: dict of op -> dict(calls, seconds, matches, bytes_in, bytes_out)
+        """
+        with self._lock:
+            return {op: stats.as_dict() for op, stats in self._ops.items()}
+
+    def reset(self):
+        with self._lock:
+            self._ops.clear()
+
+    def __reduce__(self):
+        # measurements are process-local, a copy starts empty
+        return type(self), (self.callback,)
+
+    def report(self, file=None):
+        """
+        Prints a per-op breakdown, slowest first
+
+        :param file: defaults to stderr
+        """
+        file = file or sys.stderr
+        stats = self.stats()
+        total = stats.get('transliterate', {}).get('seconds') or sum(s['seconds'] for s in stats.values()) or 1e-9
+        print('%-20s %10s %10s %9s %7s %10s %12s %12s'
+              % ('op', 'calls', 'total ms', 'us/call', '%', 'matches', 'bytes in', 'bytes out'), file=file)
+        for op, s in sorted(stats.items(), key=lambda item: -item[1]['seconds']):
+            print('%-20s %10d %10.1f %9.2f %7.1f %10d %12d %12d'
+                  % (op, s['calls'], s['seconds'] * 1e3, s['seconds'] / max(s['calls'], 1) * 1e6,
+                     100 * s['seconds'] / total, s['matches'], s['bytes_in'], s['bytes_out']), file=file)
@@ -0,0 +1,293 @@
+"""
+Incremental transliteration of text arriving in chunks (e.g. from an LLM or ASR stream) for real-time TTS
+
+A `StreamingTransliterator` buffers the incoming text and finalizes it up to the last space at which no op can
+still change its output: the tokens around a cut are checked for anything an op may join with what follows
+(numbers for dates, amounts, times, ordinals and units, currency symbols and magnitudes, unclosed brackets,
+multi-word lexicon terms). Only the tail after that space is held back. The concatenated output equals
+`PolishTransliterate.transliterate` of the concatenated input, unless `max_pending` forces a cut.
+"""
+import re
+
+from polish_transliterate.core import PolishTransliterate
+
+# previous words rewritten by `_number_unit_op` when a unit follows them
+_UNIT_CONTEXT_WORDS = ('jeden', 'jedna', 'jedną')
+# characters an ordinal (looking back at the previous word) can start with
+_ORDINAL_START = '(['
+
+_DETECT_DIGIT = re.compile('\\d')
+_DETECT_SPACES = re.compile(' +')
+_WHITESPACE = ' \t\n\r\f\v'
+
+
+def without_lexicon(transliterator):
+    """
+    Splits off the lexicon stage of a transliterator
+
+    :param transliterator: PolishTransliterate
+    :return: (lexicon or None, transliterator running the remaining ops)
+    """
+    if transliterator.lexicon is None:
+        return None, transliterator
+    lexicon = transliterator.lexicon if len(transliterator.lexicon) else None
+    return lexicon, type(transliterator)(pipeline=transliterator.pipeline, number_words=transliterator.number_words)
+
+
+def join_outputs(outputs):
+    """
+    Joins the outputs of pieces split at safe cuts like `transliterate` joins tokens
+
+    :param outputs: iterable of str
+    :return: str
+    """
+    text = None
+    for output in outputs:
+        if text is None:
+            text = output
+            continue
+        # the whitespace between the pieces collapses to one space, which stays even if a piece vanishes
+        output = output.lstrip(' ')
+        if text[-1:] != ' ':
+            output = ' ' + output
+        text += output
+    return text or ''
+
+
+def _last_whitespace(text):
+    # (end, start) of the last run of whitespace between two tokens, or None
+    pos = len(text)
+    while True:
+        pos = max(text.rfind(c, 0, pos) for c in _WHITESPACE)
+        end = pos
+        while end > 0 and text[end - 1] in _WHITESPACE:
+            end -= 1
+        if end <= 0:
+            return None
+        if pos + 1 < len(text):
+            return end, pos + 1
+        pos = end
+
+
+class SafeCuts:
+    """
+    Positions at which a text can be split into pieces that transliterate independently
+
+    A cut is a run of spaces between two tokens, none of which an op may join with the other: numbers (dates,
+    amounts, times, ordinals and units), currency symbols and magnitudes, unit context words and unclosed
+    spoken_symbol brackets. Lexicon terms are not considered, see `without_lexicon`.
+    """
+
+    def __init__(self, transliterator):
+        """
+        Constructor
+
+        :param transliterator: PolishTransliterate whose ops the cuts have to respect
+        """
+        regex = transliterator.regex
+        self._detect_currency_symbol = regex.DETECT_CURRENCY_SYMBOL.search
+        self._detect_currency_magnitude = regex.DETECT_CURRENCY_MAGNITUDE.search
+        self._brackets = tuple(getattr(transliterator.abbreviation_config, 'SPOKEN_SYMBOL', {}).keys()) \
+            if 'spoken_symbol' in transliterator.transliterate_ops else ()
+
+    def is_safe(self, text, end, start):
+        """
+        Whether `text` can be split at the run of spaces text[end:start]
+
+        :param text:
+        :param end: start of the run of spaces
+        :param start: end of the run of spaces
+        :return: bool
+        """
+        if end == 0 or start == len(text) or text[end - 1].isspace() or text[start].isspace():
+            return False
+        # the next token may be an ordinal, a date or a number looking back at this one
+        if text[start].isdigit() or text[start] in _ORDINAL_START:
+            return False
+        word = text[text.rfind(' ', 0, end) + 1:end]
+        # this token may still join a date, amount, time, ordinal or unit with the next one
+        if _DETECT_DIGIT.search(word) or self._detect_currency_symbol(word) \
+                or self._detect_currency_magnitude(word) or word.lower() in _UNIT_CONTEXT_WORDS:
+            return False
+        return not any(text.rfind(opening, 0, end) > text.rfind(closing, 0, end) for opening, closing in self._brackets)
+
+    def cuts(self, text):
+        """
+        Yields the safe cuts of `text` from left to right
+
+        :param text:
+        :return: generator of (end, start), text[:end] and text[start:] being the pieces
+        """
+        for m in _DETECT_SPACES.finditer(text):
+            if self.is_safe(text, m.start(), m.end()):
+                yield m.start(), m.end()
+
+    def last(self, text, pos=None):
+        """
+        Finds the last safe cut of `text` (ending before `pos`)
+
+        :param text:
+        :param pos: defaults to the end of the text
+        :return: (end, start) or None
+        """
+        if pos is None:
+            pos = len(text)
+        while True:
+            start = text.rfind(' ', 0, pos) + 1
+            if start <= 0:
+                return None
+            end = start - 1
+            while end > 0 and text[end - 1] == ' ':
+                end -= 1
+            if self.is_safe(text, end, start):
+                return end, start
+            pos = end
+
+    def first(self, text, pos=0):
+        """
+        Finds the first safe cut of `text` starting at or after `pos`
+
+        :param text:
+        :param pos:
+        :return: (end, start) or None
+        """
+        n = len(text)
+        while True:
+            end = text.find(' ', pos)
+            if end < 0:
+                return None
+            start = end + 1
+            while start < n and text[start] == ' ':
+                start += 1
+            if self.is_safe(text, end, start):
+                return end, start
+            pos = start
+
+
+class StreamingTransliterator:
+    """
+    Stateful wrapper around `PolishTransliterate` which accepts text chunks and emits finalized output early
+    """
+
+    def __init__(self, transliterator=None, max_pending=None, **options):
+        """
+        Constructor
+
+        :param transliterator: PolishTransliterate to use, otherwise one is created from `options`
+        :param max_pending: if set, text held back without a safe cut for more than this many characters is cut at
+                            its last whitespace anyway (bounding memory, at the price of possibly splitting e.g. a
+                            date), see `forced_cuts`
+        :param options: keyword arguments for `PolishTransliterate`
+        """
+        if transliterator is None:
+            transliterator = PolishTransliterate(**options)
+        self.transliterator = transliterator
+        self.max_pending = max_pending
+        self.forced_cuts = 0
+
+        # the lexicon is applied as a stage of its own, the other ops only ever see lexicon output
+        self.lexicon, self._transliterator = without_lexicon(transliterator)
+        # a term containing whitespace can span a cut, so that much text has to follow it
+        self._lexicon_horizon = max((len(term) for term in self.lexicon._values if any(c.isspace() for c in term)),
+                                    default=0) if self.lexicon is not None else 0
+        self._cuts = SafeCuts(self._transliterator)
+
+        self.reset()
+
+    def reset(self):
+        """
+        Drops the held back text and starts a new stream
+        """
+        self._raw = ''
+        self._text = ''
+        self._last = None
+
+    @property
+    def pending(self):
+        """
+        Input text held back until more text (or `flush`) finalizes it
+        """
+        return self._text + self._raw if self.lexicon is not None else self._text
+
+    def feed(self, chunk):
+        """
+        Adds a chunk of text
+
+        :param chunk:
+        :return: str, the output finalized by this chunk (possibly empty)
+        """
+        if self.lexicon is not None:
+            self._raw += chunk
+            cut = self._lexicon_cut(self._raw)
+            if cut:
+                self._text += self.lexicon.apply(self._raw[:cut])
+                self._raw = self._raw[cut:]
+        else:
+            self._text += chunk
+
+        cut = self._cuts.last(self._text)
+        if cut is None and self.max_pending is not None and len(self._text) > self.max_pending:
+            cut = _last_whitespace(self._text)
+            if cut is not None:
+                self.forced_cuts += 1
+        if cut is None:
+            return ''
+        end, start = cut
+        output = self._emit(self._text[:end])
+        self._text = self._text[start:]
+        return output
+
+    def flush(self):
+        """
+        Finalizes the held back text, e.g. at the end of an utterance, and starts a new stream
+
+        :return: str
+        """
+        text = self._text
+        if self.lexicon is not None:
+            text += self.lexicon.apply(self._raw)
+        output = self._emit(text) if text else ''
+        self.reset()
+        return output
+
+    def stream(self, chunks):
+        """
+        Transliterates an iterable of chunks, yielding output as soon as it is final
+
+        :param chunks: iterable of str
+        :return: generator of str
+        """
+        for chunk in chunks:
+            output = self.feed(chunk)
+            if output:
+                yield output
+        output = self.flush()
+        if output:
+            yield output
+
+    def _emit(self, text):
+        output = self._transliterator.transliterate(text)
+        if self._last is not None:
+            # the pieces are joined like tokens, the whitespace between them collapses to one space
+            output = output.lstrip(' ')
+            if self._last != ' ':
+                output = ' ' + output
+        if output:
+            self._last = output[-1]
+        elif self._last is None:
+            # a vanished first piece still separates the next one
+            self._last = ''
+        return output
+
+    def _lexicon_cut(self, text):
+        # rightmost space no lexicon term spans, with enough text after it to complete any multi-word term
+        spans = self.lexicon.find(text)
+        pos = len(text) - self._lexicon_horizon
+        while pos > 0:
+            cut = text.rfind(' ', 0, pos)
+            if cut <= 0:
+                return 0
+            if not any(start < cut < end for start, end, _ in spans):
+                return cut
+            pos = cut
+        return 0
@@ -0,0 +1,123 @@
+import json
+import random
+
+import pytest
+
+from polish_transliterate.lexicon import Lexicon
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """
+    Writes a config file (with the compiled-table cache under `tmp_path`) and returns its path
+
+    :return: callable(data) -> str
+    """
+    monkeypatch.setenv('POLISH_TRANSLITERATE_CACHE', str(tmp_path / 'cache'))
+
+    def write(data):
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps(data), encoding='utf-8')
+        return str(path)
+
+    return write
+
+
+SENTENCES = [
+    'Ala ma kota -- ',
+    '-- Ala ma kota',
+    'Dzień dobry, spotkanie jest 12.05.2024 o 10:30 w sali 5.',
+    'Kwota wynosi 1000 zł, a czas to 2h:30m -- dziękujemy!',
+    'NATO i U.S.A. podpisały umowę (art. 5) o 8:15.',
+    'Cena: 3,50 PLN +/-3 %, czyli ½ kg za 5kg  i  1/2 l.',
+    'W poniedziałek, 1 stycznia, ŻÓŁW przeszedł 5 km - bardzo   szybko.',
+    '- & - = 2+2 5x3 m2 tys mln\tkoniec.',
+    'Źródło: ½ kg -- dr Kowalski',
+    'W pon. 1 stycznia ŻÓŁW przeszedł 5 km   w 1h:20m (art. 5.)',
+    'U.S.A. i UE: 2+2 = 4, 5x3 m2 tys mln\tkoniec.',
+    '',
+]
+# texts sharing their structure, which only differ in the numbers
+TEMPLATES = [
+    'Kwota wynosi {} zł, dziękujemy!',
+    'Spotkanie {} o 10:30 w sali 5.',
+    'Przelew {} PLN z dnia 12.05.2024 zaksięgowano o {}.',
+    'Dzień dobry, -- {} -- NATO i U.S.A. (art. {}.)',
+    'Cena: {} PLN +/-3 %, czyli ½ kg za {}kg.',
+]
+VALUES = ['1000', '3,50', '12.05.2024', '8:15', '2h:30m', '1/2', '5', '2+2', '']
+# pieces of numbers, amounts, dates and times which the text ops match in many combinations
+PIECES = ['Kwota', 'dnia', 'o', 'm', 'godz', 'mln', 'USD', 'NATO', '12', '7.', '30', '+2', '3,50', '1.000,50', '1/2',
+          '12.05.2024', '1.05.', '1.1.20', '12.10', '10:30', '10.30', '2:05:07', '23.59h', '1h:20m', '10:', 'zł', '$',
+          '€', 'gr', '$5', '5$', '-3 zł', '9.30 zł', '20 gr', '5 zł.', '(12 zł)', '[3.]', '-', '.', ':', ',', '--']
+
+
+@pytest.fixture
+def sentences():
+    return list(SENTENCES)
+
+
+@pytest.fixture
+def corpus():
+    """
+    The sentences and the filled-in templates, every third text repeated
+    """
+    texts = SENTENCES + [template.format(value, value) for template in TEMPLATES for value in VALUES]
+    return texts + texts[::3]
+
+
+@pytest.fixture
+def random_texts():
+    """
+    Random texts of pieces separated by spaces, and glued together by punctuation so that matches touch each other
+
+    :return: callable(seed, size) -> list
+    """
+    def generate(seed, size=1500):
+        rnd = random.Random(seed)
+        texts = [' '.join(rnd.choice(PIECES) for _ in range(rnd.randint(1, 10))) for _ in range(size)]
+        texts += [''.join(rnd.choice(PIECES) + rnd.choice(['', ' ', '.', ':', ',']) for _ in range(rnd.randint(1, 6)))
+                  for _ in range(size)]
+        return texts
+
+    return generate
+
+
+@pytest.fixture
+def lexicon():
+    return Lexicon({'dzień dobry': 'cześć', 'kwota wynosi': 'do zapłaty', 'ma kota': 'ma psa',
+                    'dr Kowalski': 'doktor Kowalski'})
+
+
+@pytest.fixture
+def outputs():
+    """
+    Transliterates texts one by one, an exception is recorded by its type name
+
+    :return: callable(transliterator, texts) -> list
+    """
+    def transliterate(transliterator, texts):
+        results = []
+        for text in texts:
+            try:
+                results.append(transliterator.transliterate(text))
+            except Exception as e:
+                # num2words rejects some date-like pieces
+                results.append(type(e).__name__)
+        return results
+
+    return transliterate
+
+
+@pytest.fixture
+def assert_same_outputs():
+    """
+    Asserts that two lists of outputs for `texts` are equal, listing the texts whose outputs differ
+
+    :return: callable(texts, expected, actual)
+    """
+    def check(texts, expected, actual):
+        assert len(expected) == len(actual) == len(texts)
+        assert [(text, a, b) for text, a, b in zip(texts, expected, actual) if a != b] == []
+
+    return check
@@ -0,0 +1,22 @@
+from polish_transliterate.core import PolishTransliterate
+
+
+def test_acronyms_are_spelled_with_letter_names():
+    transliterator = PolishTransliterate()
+    assert transliterator.transliterate('NASA') == 'en a es a'
+    assert transliterator.transliterate('ABC') == 'a be ce'
+    assert transliterator.transliterate('Za PRL-u') == 'za pe er el u'
+    assert PolishTransliterate(sep_abbreviation='-').transliterate('NASA i ABC') == 'en-a-es-a i a-be-ce'
+
+
+def test_acronyms_are_masked_without_acronym_phoneme():
+    assert PolishTransliterate(transliterate_ops=['accent_peculiarity']).transliterate('NASA i ABC') == \
+        'n a s a i a b c'
+
+
+def test_every_occurrence_is_replaced_at_its_position():
+    transliterator = PolishTransliterate()
+    assert transliterator.transliterate('Raport NASA i NATO, znowu NASA.') == \
+        'raport en a es a i en a te o, znowu en a es a.'
+    # lowercase words spelled like an acronym are left alone
+    assert transliterator.transliterate('nasa NASA') == 'nasa en a es a'
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+import pytest
+
+from polish_transliterate.aio import AsyncTransliterator
+from polish_transliterate.core import PolishTransliterate
+
+TEXTS = ['Ala ma kota', 'Spotkanie 12.05.2024 o 10:30', 'NATO i UE', '', 'Żółw przeszedł 5 km.'] * 7
+
+
+class _Gated(PolishTransliterate):
+    # blocks in the worker thread until the gate opens, records what ran
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.gate = threading.Event()
+        self.done = []
+
+    def transliterate(self, text):
+        self.gate.wait(5)
+        self.done.append(text)
+        return super().transliterate(text)
+
+
+def test_results_equal_transliterate():
+    transliterator = PolishTransliterate()
+
+    async def texts():
+        for text in TEXTS:
+            yield text
+
+    async def run():
+        async with AsyncTransliterator(transliterator, workers=2) as aio:
+            single = [await aio.atransliterate(text) for text in TEXTS[:5]]
+            many = [text async for text in aio.atransliterate_many(TEXTS, chunksize=3)]
+            from_async = [text async for text in aio.atransliterate_many(texts(), chunksize=4)]
+        return single, many, from_async
+
+    single, many, from_async = asyncio.run(run())
+    expected = [transliterator.transliterate(text) for text in TEXTS]
+    assert single == expected[:5] and many == expected and from_async == expected
+
+
+def test_timeout_includes_waiting_for_a_slot():
+    transliterator = _Gated()
+
+    async def run():
+        async with AsyncTransliterator(transliterator, workers=1, max_concurrency=1, timeout=0.05) as aio:
+            with pytest.raises(asyncio.TimeoutError):
+                await aio.atransliterate('pierwszy')
+            # the first call still runs in its thread and holds the worker, this one waits for it
+            with pytest.raises(asyncio.TimeoutError):
+                await aio.atransliterate('drugi')
+            transliterator.gate.set()
+            return await aio.atransliterate('Ala', timeout=5)
+
+    assert asyncio.run(run()) == 'ala'
+    assert transliterator.done == ['pierwszy', 'Ala']
+
+
+def test_cancellation_drops_queued_work():
+    transliterator = _Gated()
+
+    async def run():
+        async with AsyncTransliterator(transliterator, workers=1, max_concurrency=2) as aio:
+            running = asyncio.ensure_future(aio.atransliterate('pierwszy'))
+            queued = asyncio.ensure_future(aio.atransliterate('drugi'))
+            await asyncio.sleep(0.05)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            transliterator.gate.set()
+            return await running
+
+    assert asyncio.run(run()) == 'pierwszy'
+    assert transliterator.done == ['pierwszy']
+
+
+def test_closing_many_early_cancels_pending_chunks():
+    transliterator = _Gated()
+    transliterator.gate.set()
+
+    async def run():
+        async with AsyncTransliterator(transliterator, workers=1, max_concurrency=2) as aio:
+            results = aio.atransliterate_many(TEXTS, chunksize=1)
+            first = await results.__anext__()
+            await results.aclose()
+            await asyncio.sleep(0.05)
+            return first
+
+    assert asyncio.run(run()) == 'ala ma kota'
+    # at most max_concurrency chunks were ever submitted
+    assert len(transliterator.done) <= 2
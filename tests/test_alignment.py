@@ -0,0 +1,50 @@
+from polish_transliterate.core import PolishTransliterate
+
+
+def _check(transliterator, text):
+    output, alignment = transliterator.transliterate_with_alignment(text)
+    assert output == transliterator.transliterate(text)
+    assert alignment.length == len(output) and alignment.source_length == len(text)
+
+    segments = list(alignment)
+    # the segments cover the output contiguously and map to ordered spans of the input
+    assert [seg[0] for seg in segments[1:]] == [seg[1] for seg in segments[:-1]]
+    if output:
+        assert segments[0][0] == 0 and segments[-1][1] == len(output)
+    last_start = 0
+    for out_start, out_end, in_start, in_end, copied in segments:
+        assert 0 <= last_start <= in_start <= in_end <= len(text)
+        last_start = in_start
+        if copied:
+            assert out_end - out_start == in_end - in_start
+    return output, alignment
+
+
+def _source_of(text, output, alignment, word):
+    start = output.index(word)
+    in_start, in_end = alignment.source_span(start, start + len(word))
+    return text[in_start:in_end]
+
+
+def test_alignment_matches_transliterate(sentences, lexicon):
+    for transliterator in (PolishTransliterate(), PolishTransliterate(engine='merged'),
+                           PolishTransliterate(lexicon=lexicon)):
+        for text in sentences:
+            _check(transliterator, text)
+
+
+def test_alignment_offsets():
+    text = 'Spotkanie 12.05.2024 o 10:30 w NATO, kwota 5 PLN.'
+    output, alignment = _check(PolishTransliterate(), text)
+    assert _source_of(text, output, alignment, 'dwunasty maj dwa tysiące dwadzieścia cztery') == '12.05.2024'
+    assert _source_of(text, output, alignment, 'dziesięć godzin trzydzieści minut') == '10:30'
+    assert _source_of(text, output, alignment, 'en a te o') == 'NATO'
+    assert _source_of(text, output, alignment, 'kwota') == 'kwota'
+    assert _source_of(text, output, alignment, 'pe el en') == 'PLN'
+
+    text = 'Źródło: ½ kg -- dr Kowalski'
+    output, alignment = _check(PolishTransliterate(), text)
+    assert _source_of(text, output, alignment, 'zrodlo') == 'Źródło'
+    assert _source_of(text, output, alignment, 'pół') == '½'
+    assert _source_of(text, output, alignment, 'doktor') == 'dr'
+    assert alignment.source_span(len(output), len(output)) == (len(text), len(text))
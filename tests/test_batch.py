@@ -0,0 +1,16 @@
+import pytest
+
+from polish_transliterate.batch import BatchTransliterator
+from polish_transliterate.core import PolishTransliterate
+
+
+@pytest.mark.parametrize('templates, with_lexicon', [(False, False), (True, False), (True, True)])
+def test_batch_equals_transliterate(corpus, lexicon, outputs, assert_same_outputs, templates, with_lexicon):
+    transliterator = PolishTransliterate(lexicon=lexicon if with_lexicon else None)
+    batch = BatchTransliterator(transliterator, templates=templates)
+    assert_same_outputs(corpus, outputs(transliterator, corpus), batch.transliterate_batch(corpus))
+    stats = batch.stats()
+    # repeated texts are deduplicated, texts differing only in their numbers share their pieces
+    assert stats['texts'] == len(corpus) and stats['unique_texts'] == len(set(corpus))
+    if templates:
+        assert stats['unique_pieces'] < stats['pieces']
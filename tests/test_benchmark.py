@@ -0,0 +1,46 @@
+import json
+
+from polish_transliterate import benchmark
+
+RESULTS = {
+    'end_to_end': {'dates': {'sentences_per_s': 1000.0, 'mb_per_s': 1.0}},
+    'ops': {'date': {'sentences_per_s': 5000.0, 'mb_per_s': 2.0}},
+    'startup': {'import_ms': 50.0, 'construct_ms': 5.0, 'first_call_ms': 20.0},
+}
+
+
+def _scaled(results, section, name, metric, factor):
+    scaled = json.loads(json.dumps(results))
+    scaled[section][name][metric] *= factor
+    return scaled
+
+
+def test_compare():
+    assert benchmark.compare(RESULTS, RESULTS) == []
+    # within the threshold, improvements, and entries missing from the baseline are fine
+    assert benchmark.compare(_scaled(RESULTS, 'ops', 'date', 'mb_per_s', 0.95), RESULTS) == []
+    assert benchmark.compare(RESULTS, {'end_to_end': {}}) == []
+    assert benchmark.compare(_scaled(RESULTS, 'end_to_end', 'dates', 'sentences_per_s', 2), RESULTS) == []
+
+    regressions = benchmark.compare(_scaled(RESULTS, 'end_to_end', 'dates', 'sentences_per_s', 0.5), RESULTS)
+    assert regressions == [('end_to_end', 'dates', 'sentences_per_s', 1000.0, 500.0, -0.5)]
+    slower_start = json.loads(json.dumps(RESULTS))
+    slower_start['startup']['import_ms'] = 100.0
+    assert benchmark.compare(slower_start, RESULTS, threshold=0.5) == [('startup', 'cold', 'import_ms', 50.0, 100.0,
+                                                                        1.0)]
+    assert benchmark.compare(slower_start, RESULTS, threshold=1.5) == []
+
+
+def test_exit_codes(tmp_path):
+    args = ['--sentences', '20', '--repeat', '1', '--corpora', 'dates', '--ops', 'date', '--startup-runs', '0']
+    output = tmp_path / 'results.json'
+    assert benchmark.main(args + ['--output', str(output)]) == 0
+    results = json.loads(output.read_text(encoding='utf-8'))
+    assert set(results['end_to_end']) == {'dates'} and set(results['ops']) == {'date'}
+
+    # a baseline far faster than any run fails, a far slower one passes
+    for factor, code in ((1000, 1), (0.001, 0)):
+        baseline = _scaled(results, 'end_to_end', 'dates', 'sentences_per_s', factor)
+        path = tmp_path / 'baseline.json'
+        path.write_text(json.dumps(baseline), encoding='utf-8')
+        assert benchmark.main(args + ['--output', str(tmp_path / 'current.json'), '--baseline', str(path)]) == code
@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from polish_transliterate.cache import MemoryCache, ResultCache, SqliteCache
+from polish_transliterate.core import PolishTransliterate
+from polish_transliterate.lexicon import Lexicon
+
+
+def test_result_cache_is_abstract():
+    with pytest.raises(TypeError):
+        ResultCache()
+
+
+@pytest.mark.parametrize('make_cache', [MemoryCache, lambda **kw: SqliteCache(kw.pop('path'), **kw)])
+def test_ttl_zero_expires_at_once(tmp_path, make_cache):
+    kwargs = {'ttl': 0}
+    if make_cache is not MemoryCache:
+        kwargs['path'] = str(tmp_path / 'cache.db')
+    cache = make_cache(**kwargs)
+    cache.set('ns', 'a', 'b')
+    time.sleep(0.01)
+    assert cache.get('ns', 'a') is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_sqlite_limit_holds_after_every_write(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = SqliteCache(path, max_bytes=200)
+    for i in range(100):
+        cache.set('ns', 'text %d' % i, 'result %d' % i)
+        assert cache.stats()['bytes'] <= 200
+    cache.set('ns', 'text 99', 'replaced')
+    assert cache.get('ns', 'text 99') == 'replaced'
+    assert cache.get('ns', 'text 0') is None
+    stats = cache.stats()
+    with sqlite3.connect(path) as connection:
+        assert connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0] == stats['bytes']
+    cache.clear()
+    assert cache.stats()['bytes'] == 0
+
+
+def test_sqlite_limit_holds_across_worker_processes(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    transliterator = PolishTransliterate(cache=SqliteCache(path, max_bytes=2000))
+    texts = ['Dnia %d.05.2024 o %d:30 kwota %d zł' % (i % 28 + 1, i % 24, i) for i in range(600)]
+    results = list(transliterator.transliterate_many(texts, workers=2, chunksize=16, executor='process'))
+    assert results == [PolishTransliterate().transliterate(text) for text in texts]
+    assert 0 < SqliteCache(path).stats()['bytes'] <= 2000
+
+
+@pytest.mark.parametrize('make_cache', [lambda path: MemoryCache(), SqliteCache])
+def test_lexicon_changes_are_not_served_from_the_cache(tmp_path, make_cache):
+    lexicon = Lexicon({'kot': 'pies'})
+    transliterator = PolishTransliterate(lexicon=lexicon, cache=make_cache(str(tmp_path / 'cache.db')))
+    assert transliterator.transliterate('Ala ma kota i kot') == 'ala ma kota i pies'
+    lexicon.add({'kot': 'chomik'})
+    assert transliterator.transliterate('Ala ma kota i kot') == 'ala ma kota i chomik'
+
+
+def test_backends_count_utf8_bytes(tmp_path):
+    for cache in (MemoryCache(), SqliteCache(str(tmp_path / 'cache.db'))):
+        cache.set('ns', 'żółw', 'zolw')
+        cache.set('ns', 'Ala', 'ala')
+        assert cache.stats()['bytes'] == 7 + 4 + 3 + 3
+    # the limit means the same for both
+    for cache in (MemoryCache(max_bytes=11), SqliteCache(str(tmp_path / 'limited.db'), max_bytes=11)):
+        cache.set('ns', 'żółw', 'zolw')
+        assert cache.get('ns', 'żółw') == 'zolw'
+        cache.set('ns', 'żółwie', 'zolwie')
+        assert cache.get('ns', 'żółwie') is None
+
+
+def test_sqlite_close_reaches_every_thread(tmp_path):
+    with SqliteCache(str(tmp_path / 'cache.db')) as cache:
+        cache.set('ns', 'a', 'b')
+        connections = [cache._connection()]
+        thread = threading.Thread(target=lambda: connections.append(cache._connection()))
+        thread.start()
+        thread.join()
+    for connection in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute('SELECT 1')
+    # a closed cache reconnects when used again
+    assert cache.get('ns', 'a') == 'b'
+    cache.close()
@@ -0,0 +1,29 @@
+import json
+
+from polish_transliterate.cli import main
+
+
+def test_jsonl_passes_through_records_without_a_string_field(tmp_path, capsys):
+    lines = ['{"text": "Dnia 12.05.2024", "id": 1}', '{"text": 5}', '[1, 2]', '{"id": 2}', 'not json', '',
+             '{"text": null}', '{"text": "ŻÓŁW"}']
+    source = tmp_path / 'in.jsonl'
+    source.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    target = tmp_path / 'out.jsonl'
+
+    assert main(['--jsonl', '-q', '-o', str(target), str(source)]) == 0
+
+    output = target.read_text(encoding='utf-8').splitlines()
+    assert json.loads(output[0]) == {'text': 'dnia dwunasty maj dwa tysiące dwadzieścia cztery', 'id': 1}
+    assert output[1:6] == ['{"text": 5}', '[1, 2]', '{"id": 2}', 'not json', '{"text": null}']
+    assert json.loads(output[6]) == {'text': 'z o l w'}
+    assert 'line 5: invalid JSON' in capsys.readouterr().err
+
+
+def test_jsonl_output_field(tmp_path):
+    source = tmp_path / 'in.jsonl'
+    source.write_text('{"text": "Dzień dobry"}\n', encoding='utf-8')
+    target = tmp_path / 'out.jsonl'
+
+    main(['--jsonl', '-q', '--output-field', 'normalized', '-o', str(target), str(source)])
+
+    assert json.loads(target.read_text(encoding='utf-8')) == {'text': 'Dzień dobry', 'normalized': 'dzien dobry'}
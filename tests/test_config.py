@@ -0,0 +1,21 @@
+from polish_transliterate.core import PolishTransliterate
+
+
+def test_extended_tables_apply(config_file):
+    config = config_file({'extend': {'MISC': {'inz.': 'inżynier'}}})
+    transliterator = PolishTransliterate(config=config)
+    assert transliterator.transliterate('Pan inż. Kowalski') == 'pan inżynier kowalski'
+
+
+def test_alphabetic_math_symbol_and_special_keys(config_file):
+    # ops whose built-in keys never occur in purely alphabetic words must not skip such words with custom keys
+    config = config_file({'extend': {'MATH_SYMBOL': {'x': 'razy'},
+                                     'SPECIAL_TRANSLITERATE': {'\\bwg\\b': ['wg', 'według']}}})
+    ops = ['accent_peculiarity', 'special', 'math_symbol']
+    transliterator = PolishTransliterate(transliterate_ops=ops, config=config)
+    assert {'special', 'math_symbol'} <= transliterator.pipeline.alpha_word_ops
+    assert transliterator.transliterate('5 x 3 wg planu') == 'pięć razy trzy według planu'
+
+    builtin = PolishTransliterate(transliterate_ops=ops)
+    assert not {'special', 'math_symbol'} & builtin.pipeline.alpha_word_ops
+    assert builtin.transliterate('5 x 3 wg planu') == 'pięć x trzy wg planu'
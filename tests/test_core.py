@@ -0,0 +1,66 @@
+import copy
+import pickle
+import threading
+
+import pytest
+
+from polish_transliterate.core import PolishTransliterate
+
+
+def test_parameters_are_read_only():
+    transliterator = PolishTransliterate(transliterate_ops=['date'], replace={'-': ' '})
+    assert transliterator.transliterate_ops == ('date',)
+    assert dict(transliterator.replace) == {'-': ' '}
+    for name, value in (('transliterate_ops', ['ordinal']), ('replace', {}), ('sep_abbreviation', '|'),
+                        ('make_lowercase', False)):
+        with pytest.raises(AttributeError):
+            setattr(transliterator, name, value)
+    with pytest.raises(TypeError):
+        transliterator.replace['x'] = 'y'
+    assert transliterator.transliterate('Dnia 12.05.2024') == 'dnia dwunasty maj dwa tysiące dwadzieścia cztery'
+
+
+def test_skip_stats_count_every_thread():
+    transliterator = PolishTransliterate()
+    texts = ['Ala ma kota', 'Spotkanie 12.05.2024 o 10:30', 'NATO i UE'] * 20
+
+    def work():
+        for text in texts:
+            transliterator.transliterate(text)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    work()
+    for thread in threads:
+        thread.join()
+    stats = transliterator.skip_stats()
+    assert stats['texts'] == 5 * len(texts)
+    assert stats['skipped']['date'] == 5 * 40
+    # the counts of ended threads are kept, another thread starting to count folds them
+    assert transliterator.skip_stats() == stats
+    thread = threading.Thread(target=transliterator.transliterate, args=('Ala ma kota',))
+    thread.start()
+    thread.join()
+    assert transliterator.skip_stats()['texts'] == stats['texts'] + 1
+    assert len(transliterator._skip_live) == 1
+
+    transliterator.clear_skip_stats()
+    assert transliterator.skip_stats() == {'texts': 0, 'skipped': {}}
+
+
+def test_pickle_and_deepcopy_round_trip():
+    from polish_transliterate.cache import MemoryCache
+    from polish_transliterate.lexicon import Lexicon
+    from polish_transliterate.profiling import Profiler
+
+    transliterator = PolishTransliterate(lexicon=Lexicon({'dzień dobry': 'cześć'}), cache=MemoryCache(),
+                                         profiler=Profiler())
+    text = 'Dzień dobry, spotkanie 12.05.2024 o 10:30'
+    expected = transliterator.transliterate(text)
+    for copied in (pickle.loads(pickle.dumps(transliterator)), copy.deepcopy(transliterator)):
+        assert copied.pipeline == transliterator.pipeline
+        assert copied.skip_stats() == {'texts': 0, 'skipped': {}}
+        assert copied.profiler.stats() == {} and len(copied.cache) == 0
+        assert copied.transliterate(text) == expected
+        assert copied.skip_stats()['texts'] == 1
@@ -0,0 +1,57 @@
+import io
+import mmap
+
+import pytest
+
+from polish_transliterate.core import PolishTransliterate
+from polish_transliterate.document import DocumentTransliterator
+
+
+@pytest.fixture
+def text(sentences):
+    return '\n'.join(sentences) * 3
+
+
+def _transliterate(document, source):
+    target = io.StringIO()
+    written = document.transliterate_file(source, target)
+    assert written == len(target.getvalue())
+    return target.getvalue()
+
+
+def test_windows_equal_transliterate(text):
+    transliterator = PolishTransliterate()
+    expected = transliterator.transliterate(text)
+    for window in (1, 7, 64, 4096):
+        # the default limit on the pending text would force cuts into windows this small
+        document = DocumentTransliterator(transliterator, window=window, max_window=len(text))
+        assert _transliterate(document, io.StringIO(text)) == expected, window
+        # multibyte characters are split between the windows of binary input
+        assert _transliterate(document, io.BytesIO(text.encode('utf-8'))) == expected, window
+        assert document.stats()['forced_cuts'] == 0
+
+
+def test_mmap_and_binary_target(tmp_path, text):
+    transliterator = PolishTransliterate()
+    path = tmp_path / 'document.txt'
+    path.write_bytes(text.encode('utf-8'))
+    target = io.BytesIO()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+        DocumentTransliterator(transliterator, window=13).transliterate_file(source, target)
+    assert target.getvalue().decode('utf-8') == transliterator.transliterate(text)
+
+
+def test_windows_equal_transliterate_with_lexicon(text, lexicon):
+    transliterator = PolishTransliterate(lexicon=lexicon)
+    document = DocumentTransliterator(transliterator, window=5)
+    assert _transliterate(document, io.StringIO(text)) == transliterator.transliterate(text)
+
+
+def test_forced_cuts_bound_the_pending_text():
+    # numbers in a row never leave a safe cut, the limit cuts them at whitespace
+    text = ' '.join(str(i) for i in range(1, 21))
+    document = DocumentTransliterator(window=4, max_window=8)
+    assert _transliterate(document, io.StringIO(text)) == PolishTransliterate().transliterate(text)
+    stats = document.stats()
+    assert stats['forced_cuts'] > 0
+    assert stats['documents'] == 1 and stats['chars_in'] == len(text)
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+from polish_transliterate import core
+
+SCRIPT = '''
+import sys
+import polish_transliterate
+from polish_transliterate.core import PolishTransliterate
+heavy = ('num2words', 'concurrent.futures.process', 'multiprocessing')
+assert not any(name in sys.modules for name in heavy), [name for name in heavy if name in sys.modules]
+transliterator = PolishTransliterate()
+assert transliterator.transliterate('Ala ma kota') == 'ala ma kota'
+assert 'num2words' not in sys.modules
+assert transliterator.transliterate('5 km') == 'pięć kilometr'
+assert 'num2words' in sys.modules
+'''
+
+
+def test_num2words_is_imported_on_first_use():
+    # a fresh interpreter, this one has num2words loaded already
+    root = os.path.dirname(os.path.dirname(os.path.abspath(core.__file__)))
+    result = subprocess.run([sys.executable, '-c', SCRIPT], capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=root))
+    assert result.returncode == 0, result.stderr
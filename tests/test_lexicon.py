@@ -0,0 +1,70 @@
+import random
+
+from polish_transliterate.lexicon import Lexicon, _fold
+
+
+def _naive_find(entries, text):
+    # reference: the longest valid term at each position, left to right
+    values = {}
+    for term, replacement in entries:
+        if term:
+            values[''.join(map(_fold, term))] = replacement
+    folded = ''.join(map(_fold, text))
+    spans = []
+    start = 0
+    while start < len(folded):
+        best = None
+        for end in range(start + 1, len(folded) + 1):
+            term = folded[start:end]
+            if term not in values:
+                continue
+            if term[0].isalnum() and start > 0 and folded[start - 1].isalnum():
+                continue
+            if term[-1].isalnum() and end < len(folded) and folded[end].isalnum():
+                continue
+            best = end
+        if best is None:
+            start += 1
+        else:
+            spans.append((start, best, values[folded[start:best]]))
+            start = best
+    return spans
+
+
+def test_find_equals_brute_force():
+    rnd = random.Random(7)
+    alphabet = 'abAB1 .-ż'
+    for _ in range(3000):
+        entries = [(''.join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 4))), str(i))
+                   for i in range(rnd.randint(1, 6))]
+        text = ''.join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 20)))
+        assert Lexicon(entries).find(text) == _naive_find(entries, text), (entries, text)
+
+
+def test_leftmost_longest_and_word_boundaries():
+    lexicon = Lexicon({'new': 'nju', 'new york': 'nju jork', 'york city': 'jork siti', 'c++': 'ce plus plus'})
+    assert lexicon.apply('New York City') == 'nju jork City'
+    assert lexicon.apply('newer news, new') == 'newer news, nju'
+    # terms ending in punctuation have no boundary on that side
+    assert lexicon.apply('c++11 i c++') == 'ce plus plus11 i ce plus plus'
+    assert Lexicon({'ABC': 'x'}, case_sensitive=True).apply('abc ABC') == 'abc x'
+
+
+def test_later_entries_win():
+    lexicon = Lexicon([('Kot', 'a'), ('kot', 'b')])
+    assert lexicon.apply('kot') == 'b'
+    lexicon.add({'KOT': 'c', 'pies': 'd'})
+    assert lexicon.apply('kot i pies') == 'c i d'
+    assert len(lexicon) == 2
+
+
+def test_save_load_round_trip(tmp_path):
+    path = tmp_path / 'lexicon.tsv'
+    path.write_text('# brands\nNATO\tnato\n\ndzień dobry\tcześć\nc++\tce plus plus\n', encoding='utf-8')
+    lexicon = Lexicon.from_tsv(str(path))
+    assert len(lexicon) == 3 and 'Dzień Dobry' in lexicon
+    lexicon.save(str(tmp_path / 'lexicon.bin'))
+    loaded = Lexicon.load(str(tmp_path / 'lexicon.bin'))
+    assert loaded.digest() == lexicon.digest()
+    text = 'Dzień dobry, NATO i c++.'
+    assert loaded.find(text) == lexicon.find(text) == [(0, 11, 'cześć'), (13, 17, 'nato'), (20, 23, 'ce plus plus')]
@@ -0,0 +1,42 @@
+import pickle
+
+from num2words import num2words
+
+from polish_transliterate.core import NumberWords
+
+VALUES = {
+    'cardinal': [0, 7, 21, 105, 1000, 9999, 10000, 123456, '42', '0', 3.5],
+    'ordinal': [1, 2, 12, 31, 32, 100, '5'],
+    'year': [1899, 1900, 1984, 2024, 2099, 2100, '2000'],
+}
+
+
+def test_conversions_equal_num2words():
+    for number_words in (NumberWords(), NumberWords(precompute=True), NumberWords(maxsize=0)):
+        for to, values in VALUES.items():
+            for value in values:
+                assert number_words.convert(value, to) == num2words(value, lang='pl', to=to), (to, value)
+
+
+def test_tables_cover_their_ranges():
+    number_words = NumberWords(precompute=True)
+    for to, values in NumberWords.TABLE_RANGES.items():
+        for value in (values[0], values[len(values) // 2], values[-1]):
+            assert number_words.convert(value, to) == num2words(value, lang='pl', to=to)
+
+
+def test_stats():
+    number_words = NumberWords(precompute=True)
+    for _ in range(3):
+        number_words.cardinal(12)
+        number_words.cardinal(123456)
+        number_words.ordinal(100)
+    stats = number_words.stats()
+    assert stats['cardinal'] == {'hits': 2, 'misses': 1, 'table_hits': 3, 'size': 1, 'maxsize': 4096}
+    assert (stats['ordinal']['hits'], stats['ordinal']['misses'], stats['ordinal']['table_hits']) == (2, 1, 0)
+    assert stats['year'] == {'hits': 0, 'misses': 0, 'table_hits': 0, 'size': 0, 'maxsize': 4096}
+
+    copy = pickle.loads(pickle.dumps(number_words))
+    assert copy.precompute and copy.stats()['cardinal']['table_hits'] == 0
+    number_words.clear()
+    assert number_words.stats()['cardinal'] == {'hits': 0, 'misses': 0, 'table_hits': 0, 'size': 0, 'maxsize': 4096}
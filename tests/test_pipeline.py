@@ -0,0 +1,56 @@
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from polish_transliterate import core
+from polish_transliterate.core import PolishTransliterate, clear_pipeline_cache, compile_pipeline
+
+
+def test_pipeline_is_shared_and_pickles_to_the_cached_copy():
+    pipeline = compile_pipeline(transliterate_ops=['date'])
+    assert compile_pipeline(transliterate_ops=['date']) is pipeline
+    assert pickle.loads(pickle.dumps(pipeline)) is pipeline
+
+
+def test_pipeline_tables_are_read_only():
+    pipeline = PolishTransliterate().pipeline
+    with pytest.raises(AttributeError):
+        pipeline.month_index = {}
+    for table in (pipeline.accent_table, pipeline.misc_index, pipeline.weekday_index, pipeline.month_index,
+                  pipeline.op_gates):
+        with pytest.raises(TypeError):
+            table['x'] = 'y'
+
+
+def test_pipeline_cache_is_bounded():
+    clear_pipeline_cache()
+    first = compile_pipeline(replace={'-': ' ', 'x0': 'y'})
+    for i in range(core.PIPELINE_CACHE_SIZE + 10):
+        compile_pipeline(replace={'-': ' ', 'x%d' % i: 'y'})
+    assert len(core._PIPELINE_CACHE) == core.PIPELINE_CACHE_SIZE
+    # the evicted pipeline still works for instances holding it, a new lookup builds a fresh one
+    assert PolishTransliterate(pipeline=first).transliterate('x0') == 'y'
+    assert compile_pipeline(replace={'-': ' ', 'x0': 'y'}) is not first
+    clear_pipeline_cache()
+    assert not core._PIPELINE_CACHE
+
+
+def test_accent_table_is_read_from_the_pipeline():
+    transliterator = PolishTransliterate()
+    assert transliterator.accent_table is transliterator.pipeline.accent_table
+    with pytest.raises(AttributeError):
+        transliterator.accent_table = {}
+
+
+def test_op_sets_give_the_same_key_in_every_process():
+    # set iteration order depends on the hash seed, the key must not
+    script = ('from polish_transliterate.core import compile_pipeline; '
+              "print(compile_pipeline(transliterate_ops={'ordinal', 'date', 'special', 'weekday', 'month', "
+              "'accent_peculiarity', 'custom'}).transliterate_ops)")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(core.__file__)))
+    keys = {subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True,
+                           env=dict(os.environ, PYTHONHASHSEED=str(seed), PYTHONPATH=root)).stdout for seed in range(6)}
+    assert keys == {"('accent_peculiarity', 'date', 'weekday', 'month', 'ordinal', 'special', 'custom')\n"}
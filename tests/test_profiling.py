@@ -0,0 +1,42 @@
+from polish_transliterate.core import PolishTransliterate
+from polish_transliterate.profiling import Profiler
+
+
+def test_profiler_records_utf8_bytes():
+    profiler = Profiler()
+    transliterator = PolishTransliterate(transliterate_ops=['accent_peculiarity'], profiler=profiler)
+    assert transliterator.transliterate('Żółw') == 'zolw'
+    stats = profiler.stats()['transliterate']
+    assert (stats['calls'], stats['bytes_in'], stats['bytes_out']) == (1, 7, 4)
+    # every folded character
+    assert profiler.stats()['accent_peculiarity']['matches'] == 3
+
+
+def test_nested_calls_are_not_counted_as_ops(config_file):
+    # amounts spell their currency with the acronym op, which must not show up as an acronym_phoneme call
+    config = config_file({'extend': {'CURRENCY_SYMBOL': {'$': 'dolar'}}})
+    profiler = Profiler()
+    transliterator = PolishTransliterate(transliterate_ops=['accent_peculiarity', 'amount_money'], config=config,
+                                         profiler=profiler)
+    assert transliterator.transliterate('Kosztuje 5 $ lub 12,50 $ i 3 $.') == \
+        'kosztuje pięć dolar lub dwanaście dolar pięćdziesiąt i trzy dolar.'
+    stats = profiler.stats()
+    assert (stats['amount_money']['calls'], stats['amount_money']['matches']) == (1, 3)
+    assert 'acronym_phoneme' not in stats
+
+
+def test_matches_are_counted_per_match():
+    text = 'NASA i NATO: od 12.05.2024 do 1.06.2024 i 3.07.2024, o 10:30:15 i 8:05:07. Żółw w pon.'
+    for engine in ('sequential', 'merged'):
+        profiler = Profiler()
+        PolishTransliterate(engine=engine, profiler=profiler).transliterate(text)
+        stats = {op: s['matches'] for op, s in profiler.stats().items()}
+        assert (stats['detect_acronyms'], stats['acronym_phoneme'], stats['accent_peculiarity']) == (2, 2, 3)
+        if engine == 'merged':
+            assert stats['merged_text_ops'] == 5
+        else:
+            assert (stats['date'], stats['timestamp'], stats['time_of_day']) == (3, 2, 0)
+        # the spans of all text-level ops
+        assert stats['transliterate'] == 7
+        # word ops match per changed word: the six numbers of the timestamps
+        assert stats['number_unit'] == 6 and stats['ordinal'] == 0
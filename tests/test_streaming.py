@@ -0,0 +1,36 @@
+from polish_transliterate.core import PolishTransliterate
+from polish_transliterate.streaming import StreamingTransliterator, join_outputs
+
+
+def _split_equals_whole(transliterator, text):
+    expected = transliterator.transliterate(text)
+    for i in range(len(text) + 1):
+        stream = StreamingTransliterator(transliterator)
+        output = stream.feed(text[:i]) + stream.feed(text[i:]) + stream.flush()
+        assert output == expected, (text, i)
+
+
+def test_every_two_way_split_equals_transliterate(sentences):
+    transliterator = PolishTransliterate()
+    for text in sentences:
+        _split_equals_whole(transliterator, text)
+
+
+def test_every_two_way_split_equals_transliterate_with_lexicon(sentences, lexicon):
+    transliterator = PolishTransliterate(lexicon=lexicon)
+    for text in sentences:
+        _split_equals_whole(transliterator, text)
+
+
+def test_stream_of_single_characters(sentences):
+    transliterator = PolishTransliterate()
+    text = ' '.join(sentences)
+    output = ''.join(StreamingTransliterator(transliterator).stream(text))
+    assert output == transliterator.transliterate(text)
+
+
+def test_join_outputs_keeps_the_space_of_vanished_pieces():
+    assert join_outputs(['ala ma kota', '']) == 'ala ma kota '
+    assert join_outputs(['', 'ala']) == ' ala'
+    assert join_outputs(['ala ', '', 'kota']) == 'ala kota'
+    assert join_outputs([]) == ''
@@ -0,0 +1,34 @@
+from polish_transliterate.core import PolishTransliterate
+
+DATES = ['12.05.2024', '1.06.2024', '31.12.2025', '1.1.20', '12.05.2024']
+
+
+def _each_alone(transliterator, items, sep):
+    # every match in a text must expand as if it stood alone, whatever the earlier expansions did to the offsets
+    assert transliterator.transliterate(sep.join(items)) == sep.join(transliterator.transliterate(item)
+                                                                      for item in items)
+
+
+def test_several_dates():
+    for transliterator in (PolishTransliterate(), PolishTransliterate(transliterate_ops=['date'])):
+        _each_alone(transliterator, DATES, ' i ')
+        _each_alone(transliterator, DATES, ', ')
+    transliterator = PolishTransliterate()
+    assert transliterator.transliterate('Od 12.05.2024 do 1.06.2024.') == \
+        'od dwunasty maj dwa tysiące dwadzieścia cztery do pierwszy czerwiec dwa tysiące dwadzieścia cztery.'
+
+
+def test_several_timestamps_times_and_amounts(config_file):
+    for transliterator in (PolishTransliterate(), PolishTransliterate(transliterate_ops=['timestamp', 'time_of_day'])):
+        _each_alone(transliterator, ['10:30:15', '8:05:07', '23:59:59', '10:30:15'], ' i ')
+        _each_alone(transliterator, ['1h:20m', '2h:30m', '12h:05m'], ', ')
+        _each_alone(transliterator, ['10:30', '12:15', '23:59', '8:05'], ' i ')
+        _each_alone(transliterator, ['10:30:15', '1h:20m', '8:15', '2h:30m', '12:00:01'], ' oraz ')
+
+    # amounts only match symbol currencies
+    config = config_file({'extend': {'CURRENCY_SYMBOL': {'zł': 'złoty', '$': 'dolar'}}})
+    transliterator = PolishTransliterate(config=config)
+    _each_alone(transliterator, ['5 zł', '12,50 zł', '1000 $', '3 $', '5 zł'], ' i ')
+    assert transliterator.transliterate('Spotkanie o 10:30, rachunek 12,50 zł, koniec 1h:20m.') == \
+        ' '.join([transliterator.transliterate('Spotkanie o 10:30,'), transliterator.transliterate('rachunek 12,50 zł,'),
+                  transliterator.transliterate('koniec 1h:20m.')])
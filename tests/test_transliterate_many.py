@@ -0,0 +1,36 @@
+import pytest
+
+from polish_transliterate.core import PolishTransliterate
+
+TEXTS = ['Ala ma kota', 'Spotkanie 12.05.2024 o 10:30', 'NATO i UE', '', 'Żółw przeszedł 5 km.']
+
+
+@pytest.mark.parametrize('executor', ['process', 'thread'])
+def test_results_keep_input_order_and_duplicates(executor):
+    transliterator = PolishTransliterate()
+    # duplicates, across and within chunks of 3
+    texts = [TEXTS[i % len(TEXTS)] for i in range(40)] + TEXTS[:1] * 5
+    results = list(transliterator.transliterate_many(texts, workers=2, chunksize=3, executor=executor))
+    assert results == [transliterator.transliterate(text) for text in texts]
+
+
+def test_input_is_consumed_lazily():
+    transliterator = PolishTransliterate()
+    consumed = []
+
+    def texts():
+        for i in range(100):
+            consumed.append(i)
+            yield TEXTS[i % len(TEXTS)]
+
+    results = transliterator.transliterate_many(texts(), workers=2, chunksize=4, executor='thread')
+    assert next(results) == transliterator.transliterate(TEXTS[0])
+    # at most 2 * workers chunks in flight
+    assert len(consumed) <= 2 * 2 * 4 + 1
+    results.close()
+
+
+def test_single_worker_runs_in_process():
+    transliterator = PolishTransliterate()
+    assert list(transliterator.transliterate_many(iter(TEXTS * 2), workers=1)) == \
+        [transliterator.transliterate(text) for text in TEXTS * 2]
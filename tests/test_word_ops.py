@@ -0,0 +1,26 @@
+from polish_transliterate.core import PolishTransliterate
+
+
+def test_weekday_and_month_abbreviations():
+    transliterator = PolishTransliterate(transliterate_ops=['accent_peculiarity', 'weekday', 'month'])
+    assert transliterator.transliterate('W pon. i wt. spotkanie') == 'w poniedziałek i wtorek spotkanie'
+    assert transliterator.transliterate('(sob.)') == '(sobota)'
+    assert transliterator.transliterate('Do 5 sty. 2024') == 'do pięć styczeń dwa tysiące dwadzieścia cztery'
+
+
+def test_misc_lookup_strips_and_keeps_punctuation():
+    transliterator = PolishTransliterate()
+    assert transliterator.transliterate('[itd.') == '[i tak dalej'
+    assert transliterator.transliterate('np.,') == 'na przykład,'
+    assert transliterator.transliterate('(dr)') == '(doktor)'
+    assert transliterator.transliterate('Kot, psy itd.') == 'kot, psy i tak dalej'
+    assert transliterator.transliterate('dr Kowalski') == 'doktor kowalski'
+
+
+def test_trailing_ordinal():
+    # as with the split at single spaces, a word followed by a space has a (possibly empty) next word
+    transliterator = PolishTransliterate()
+    assert transliterator.transliterate('Był 2. ') == 'byl drugi'
+    assert transliterator.transliterate('Był 2.  ') == 'byl drugi'
+    assert transliterator.transliterate('Był 2. raz') == 'byl drugi raz'
+    assert transliterator.transliterate('Był 2.') == 'byl dwa'